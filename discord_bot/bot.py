@@ -13,6 +13,7 @@ from services.forum_sync_service import ForumSyncService
 from utils.logger import setup_logging
 from database.firebase_manager import DatabaseManager
 from services.logging_service import get_logging_service
+from services.paste_service import close_paste_session
 
 # Setup logging
 setup_logging()
@@ -24,7 +25,16 @@ intents.message_content = True
 intents.guilds = True
 intents.members = True
 
-bot = commands.Bot(command_prefix="!", intents=intents)
+
+class TaskMasterBot(commands.Bot):
+    async def close(self):
+        # Close the shared paste session before the loop goes away, so
+        # aiohttp does not warn about an unclosed session on shutdown.
+        await close_paste_session()
+        await super().close()
+
+
+bot = TaskMasterBot(command_prefix="!", intents=intents)
 
 # Services
 reminder_service = ReminderService()
@@ -146,8 +156,8 @@ async def forum_sync_updater():
     if not Settings.TASK_FORUM_CHANNEL:
         return
     try:
-        await forum_sync_service.sync_from_database()
-        await forum_sync_service.drain_log_events(Settings.TASKMASTER_USERNAME)
+        # The mapping save and the log-event clear land in a single DB write.
+        await forum_sync_service.sync_and_drain_log_events(Settings.TASKMASTER_USERNAME)
         await dashboard_service.update_dashboard()
     except Exception as e:
         logger.error(f"Error syncing forum/dashboard: {e}")
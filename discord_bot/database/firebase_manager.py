@@ -4,7 +4,8 @@ Firebase database manager - uses same backend as web app and desktop client
 import os
 import json
 import logging
-from typing import List, Optional, Dict, Union
+import time
+from typing import Callable, Iterator, List, Optional, Dict, Union
 import firebase_admin
 from firebase_admin import credentials, db
 from .task_model import Task
@@ -157,6 +158,71 @@ class DatabaseManager:
                     f"Failed UUID backfill for user {username}: {e}")
         return tasks
 
+    def iter_tasks(self, username: str, batch_size: int = 500,
+                   raw_filter: Optional[Callable[[Dict], bool]] = None,
+                   start_after: Optional[str] = None) -> Iterator[List[Task]]:
+        """Yield a user's tasks in pages of up to *batch_size*, in key order.
+
+        Firebase is paged server-side, so only one page is held at a time.
+        Unlike load_tasks this neither sorts by order nor backfills UUIDs;
+        tasks stored without a UUID are skipped (load_tasks assigns them one).
+        If *raw_filter* is given, only stored task dicts it accepts are turned
+        into Task objects; the rest are dropped before any parsing. With
+        *start_after*, iteration resumes after that task key.
+        """
+        skipped = 0
+
+        def page_of(items) -> List[Task]:
+            nonlocal skipped
+            page = []
+            for task_id, task_data in items:
+                if raw_filter is not None and not raw_filter(task_data):
+                    continue
+                if not task_data.get("uuid"):
+                    skipped += 1
+                    continue
+                page.append(Task.from_dict(task_data, task_id))
+            return page
+
+        if self.use_firebase:
+            tasks_ref = db.reference(f"users/{username}/tasks")
+            last_key = start_after
+            while True:
+                try:
+                    query = tasks_ref.order_by_key()
+                    if last_key is None:
+                        tasks_data = query.limit_to_first(batch_size).get()
+                    else:
+                        # start_at is inclusive; fetch one extra and drop last_key.
+                        tasks_data = query.start_at(last_key).limit_to_first(batch_size + 1).get()
+                except Exception as e:
+                    logger.error(f"Failed to load tasks from Firebase: {e}")
+                    return
+                items = [(k, v) for k, v in (tasks_data or {}).items() if k != last_key]
+                if items:
+                    yield page_of(items)
+                if len(items) < batch_size:
+                    break
+                last_key = items[-1][0]
+        else:
+            local_file = self._get_local_file_path(username)
+            tasks_data = {}
+            if os.path.isfile(local_file):
+                try:
+                    with open(local_file, "r", encoding="utf-8") as f:
+                        tasks_data = json.load(f) or {}
+                except Exception as e:
+                    logger.error(f"Failed to read local tasks file: {e}")
+            items = sorted(tasks_data.items())
+            if start_after is not None:
+                items = [(k, v) for k, v in items if k > start_after]
+            for start in range(0, len(items), batch_size):
+                yield page_of(items[start:start + batch_size])
+
+        if skipped:
+            logger.warning(
+                f"Skipped {skipped} tasks without a UUID for user {username}")
+
     def save_tasks(self, username: str, tasks: List[Task]):
         """Save all tasks for a user"""
         tasks_data = {}
@@ -283,29 +349,32 @@ class DatabaseManager:
                 logger.error(f"Failed to save bot metadata to Firebase: {e}")
                 raise
         else:
-            # Local JSON
-            metadata_file = os.path.join(self.data_dir, "bot_metadata.json")
-            all_metadata = {}
-
-            # Load existing metadata
-            if os.path.isfile(metadata_file):
-                try:
-                    with open(metadata_file, "r", encoding="utf-8") as f:
-                        all_metadata = json.load(f)
-                except Exception as e:
-                    logger.error(f"Failed to read existing bot metadata: {e}")
+            self._save_local_metadata({key: data})
+            logger.info(f"Bot metadata '{key}' saved locally")
 
-            # Update with new data
-            all_metadata[key] = data
+    def _save_local_metadata(self, updates: Dict[str, Union[Dict, List]]):
+        """Merge *updates* into the local bot_metadata.json in a single write."""
+        metadata_file = os.path.join(self.data_dir, "bot_metadata.json")
+        all_metadata = {}
 
-            # Save back
+        # Load existing metadata
+        if os.path.isfile(metadata_file):
             try:
-                with open(metadata_file, "w", encoding="utf-8") as f:
-                    json.dump(all_metadata, f, indent=2)
-                logger.info(f"Bot metadata '{key}' saved locally")
+                with open(metadata_file, "r", encoding="utf-8") as f:
+                    all_metadata = json.load(f)
             except Exception as e:
-                logger.error(f"Failed to save bot metadata file: {e}")
-                raise
+                logger.error(f"Failed to read existing bot metadata: {e}")
+
+        # Update with new data
+        all_metadata.update(updates)
+
+        # Save back
+        try:
+            with open(metadata_file, "w", encoding="utf-8") as f:
+                json.dump(all_metadata, f, indent=2)
+        except Exception as e:
+            logger.error(f"Failed to save bot metadata file: {e}")
+            raise
 
     def get_pending_log_events(self, username: str) -> list:
         """Read and return the pending log events queue for a user."""
@@ -358,17 +427,72 @@ class DatabaseManager:
                 except Exception as e:
                     logger.error(f"Failed to clear pending log events from local file: {e}")
 
-    def get_task_thread_mappings(self) -> Dict[str, Dict[str, str]]:
-        """Get task<->thread mappings for forum sync"""
+    def _save_metadata_and_clear_events(self, metadata: Dict[str, Union[Dict, List]], username: str):
+        """Save bot metadata and clear *username*'s pending log events in one write.
+
+        Firebase gets one multi-path update and local storage rewrites
+        bot_metadata.json once.
+        """
+        if self.use_firebase:
+            updates: Dict[str, Optional[Union[Dict, List]]] = {
+                f"bot_metadata/{key}": data for key, data in metadata.items()
+            }
+            # A null value in a multi-path update deletes the node.
+            updates[f"users/{username}/_pending_log_events"] = None
+            try:
+                db.reference("/").update(updates)
+                logger.debug(f"Saved {len(metadata)} metadata key(s) and cleared log events for {username}")
+            except Exception as e:
+                logger.error(f"Failed to save bot metadata to Firebase: {e}")
+                raise
+        else:
+            self._save_local_metadata(metadata)
+            self.clear_pending_log_events(username)
+
+    def get_task_thread_mappings(self) -> Dict[str, Dict]:
+        """Get task<->thread mappings (plus per-thread sync state) for forum sync"""
         data = self.get_bot_metadata("task_forum_mappings") or {}
         return {
             "task_to_thread": data.get("task_to_thread", {}),
             "thread_to_task": data.get("thread_to_task", {}),
+            "content_hashes": data.get("content_hashes", {}),
+            "view_versions": data.get("view_versions", {}),
         }
 
-    def save_task_thread_mappings(self, task_to_thread: Dict[str, str], thread_to_task: Dict[str, str]):
-        """Persist task<->thread mappings for forum sync"""
-        self.save_bot_metadata("task_forum_mappings", {
+    def get_mappings_version(self) -> Optional[int]:
+        """Cheap change marker for the forum mappings, bumped on every save.
+
+        Returns None when no version has been recorded yet.
+        """
+        data = self.get_bot_metadata("task_forum_mappings_version")
+        if isinstance(data, dict):
+            return data.get("version")
+        return None
+
+    def save_task_thread_mappings(self, task_to_thread: Dict[str, str], thread_to_task: Dict[str, str],
+                                  content_hashes: Optional[Dict[str, str]] = None,
+                                  view_versions: Optional[Dict[str, int]] = None,
+                                  clear_log_events_for: Optional[str] = None) -> int:
+        """Persist task<->thread mappings (plus per-thread sync state) for forum sync.
+
+        With *clear_log_events_for*, that user's pending log events are cleared
+        in the same write. Returns the new mappings version.
+        """
+        mappings = {
             "task_to_thread": task_to_thread,
             "thread_to_task": thread_to_task,
-        })
+            "content_hashes": content_hashes or {},
+            "view_versions": view_versions or {},
+        }
+        version = time.time_ns()
+        if clear_log_events_for is not None:
+            self._save_metadata_and_clear_events({
+                "task_forum_mappings": mappings,
+                "task_forum_mappings_version": {"version": version},
+            }, clear_log_events_for)
+            return version
+        self.save_bot_metadata("task_forum_mappings", mappings)
+        # Written after the mappings so a reader never sees a new version
+        # paired with old mappings.
+        self.save_bot_metadata("task_forum_mappings_version", {"version": version})
+        return version
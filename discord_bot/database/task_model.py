@@ -68,6 +68,25 @@ def normalize_subtasks(subtasks: Any) -> List[Dict[str, Any]]:
     return normalized
 
 
+@dataclass(slots=True)
+class Subtask:
+    """Typed, read-only view of one normalized subtask dict (see normalize_subtasks).
+
+    Tasks keep storing subtasks as dicts; this is for hot loops over many
+    subtasks, where attribute access beats dict lookups.
+    """
+    id: int
+    name: str
+    description: str
+    url: str
+    completed: bool = False
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Subtask":
+        """Build from a dict already passed through normalize_subtasks."""
+        return cls(data['id'], data['name'], data['description'], data['url'], data['completed'])
+
+
 @dataclass
 class Task:
     """Task model matching Task-Master structure"""
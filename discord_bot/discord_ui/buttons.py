@@ -397,6 +397,11 @@ class DeleteTaskButton(discord.ui.Button):
             )
 
 
+# Bump whenever TaskView's buttons/select (or their custom_ids) change so forum
+# sync knows to re-check and re-attach the view on existing starter messages.
+TASK_VIEW_VERSION = 1
+
+
 class TaskView(discord.ui.View):
     """Persistent task-management view attached to a forum thread's starter message.
 
@@ -1,14 +1,27 @@
 """
 Service to sync tasks with Discord forum threads
 """
+import asyncio
+import functools
+import hashlib
 import logging
+from collections import defaultdict
+from itertools import chain
+from typing import Optional
 import discord
 from config.settings import Settings
+from discord_ui.buttons import TASK_VIEW_VERSION
 from services.paste_service import is_paste_url
 
 logger = logging.getLogger(__name__)
 
 _DISCORD_CONTENT_LIMIT = 2000
+# Maximum number of Discord API calls kept in flight during a forum sync.
+_SYNC_CONCURRENCY = 10
+# Maximum number of per-task log event chains dispatched at once while draining.
+_DRAIN_CONCURRENCY = 5
+# Placeholder task uuid used to build the TaskView custom_id templates.
+_PROBE_UUID = "__probe__"
 
 
 class ForumSyncService:
@@ -20,6 +33,10 @@ class ForumSyncService:
         "Low Importance":       "🔵",
         "default":              "⚪",
     }
+    # Thread-name prefixes ("<emoji> ") stripped when syncing renames back.
+    PRIORITY_PREFIXES = tuple({f"{emoji} " for emoji in PRIORITY_EMOJIS.values()})
+    # (prefix, length) pairs so a matched prefix is sliced off without len().
+    _PREFIX_STRIP = tuple((prefix, len(prefix)) for prefix in PRIORITY_PREFIXES)
 
     IMPORTANCE_LABELS = {
         "Important":            "High Importance",
@@ -31,8 +48,24 @@ class ForumSyncService:
     def __init__(self):
         self._bot = None
         self._db = None
-        self.task_to_thread = {}
-        self.thread_to_task = {}
+        # Thread ids are ints in memory; they are stored as strings only at the
+        # persistence boundary (_load_mappings / _save_mappings).
+        self.task_to_thread: dict[str, int] = {}
+        self.thread_to_task: dict[int, str] = {}
+        # task_uuid -> (fingerprint, rendered content) of the last _task_content call.
+        self._content_cache: dict[str, tuple[int, str]] = {}
+        # thread_id -> hash of the starter message content last synced to it.
+        self.content_hashes: dict[int, str] = {}
+        # thread_id -> TASK_VIEW_VERSION of the view last attached to its starter message.
+        self.view_versions: dict[int, int] = {}
+        # task uuid -> (subtask signature, registered TaskView)
+        self._view_cache: dict[str, tuple[tuple, object]] = {}
+        # Mappings version seen at the last load/save; None forces a reload.
+        self._mappings_version = None
+        # Signature of the inputs of the last sync that found nothing to do.
+        self._last_sync_signature = None
+        # Pending log event type -> logging service adapter, built on first drain.
+        self._log_handlers = None
 
     def _priority_emoji(self, priority: str) -> str:
         return self.PRIORITY_EMOJIS.get(priority, "⚪")
@@ -42,79 +75,172 @@ class ForumSyncService:
 
     def set_database(self, db):
         self._db = db
-        self._load_mappings()
+        self._mappings_version = None
+        self._refresh_mappings()
 
-    def _load_mappings(self):
+    def _refresh_mappings(self):
+        """Reload mappings only if another writer saved them since our last load/save."""
+        if not self._db:
+            return
+        try:
+            version = self._db.get_mappings_version()
+        except Exception as e:
+            logger.warning(f"Could not read forum mappings version: {e}")
+            version = None
+        if version is None or version != self._mappings_version:
+            self._load_mappings(version)
+
+    def _load_mappings(self, version=None):
         if not self._db:
             return
         try:
             mappings = self._db.get_task_thread_mappings()
-            self.task_to_thread = mappings.get("task_to_thread", {})
-            self.thread_to_task = mappings.get("thread_to_task", {})
+            self.task_to_thread = {
+                task_uuid: int(thread_id)
+                for task_uuid, thread_id in mappings.get("task_to_thread", {}).items()
+            }
+            self.thread_to_task = {
+                int(thread_id): task_uuid
+                for thread_id, task_uuid in mappings.get("thread_to_task", {}).items()
+            }
+            self.content_hashes = {
+                int(thread_id): h
+                for thread_id, h in mappings.get("content_hashes", {}).items()
+            }
+            self.view_versions = {
+                int(thread_id): v
+                for thread_id, v in mappings.get("view_versions", {}).items()
+            }
+            self._mappings_version = version
         except Exception as e:
             logger.error(f"Failed to load forum mappings: {e}")
 
-    def _save_mappings(self):
+    def _save_mappings(self, clear_log_events_for: Optional[str] = None) -> bool:
+        """Persist the mappings; returns False if the write failed.
+
+        With *clear_log_events_for*, that user's pending log events are cleared
+        in the same write.
+        """
         if not self._db:
-            return
+            return False
+        # Sync state for threads that are no longer mapped is dead weight.
+        thread_to_task = self.thread_to_task
+        self.content_hashes = {
+            thread_id: h for thread_id, h in self.content_hashes.items()
+            if thread_id in thread_to_task
+        }
+        self.view_versions = {
+            thread_id: v for thread_id, v in self.view_versions.items()
+            if thread_id in thread_to_task
+        }
         try:
-            self._db.save_task_thread_mappings(
-                self.task_to_thread, self.thread_to_task)
+            # JSON / Firebase keys must be strings.
+            self._mappings_version = self._db.save_task_thread_mappings(
+                {task_uuid: str(thread_id) for task_uuid, thread_id in self.task_to_thread.items()},
+                {str(thread_id): task_uuid for thread_id, task_uuid in thread_to_task.items()},
+                {str(thread_id): h for thread_id, h in self.content_hashes.items()},
+                {str(thread_id): v for thread_id, v in self.view_versions.items()},
+                clear_log_events_for=clear_log_events_for)
         except Exception as e:
             logger.error(f"Failed to save forum mappings: {e}")
+            return False
+        return True
 
     def get_task_uuid_for_thread(self, thread_id: int):
-        return self.thread_to_task.get(str(thread_id))
-
-    def _task_content(self, task):
-        priority_emoji = self._priority_emoji(task.colour)
+        return self.thread_to_task.get(thread_id)
+
+    @staticmethod
+    def _task_fingerprint(task) -> int:
+        """Cheap hash of every task field that feeds the starter message and view."""
+        return hash((
+            task.status,
+            task.colour,
+            task.owner,
+            task.deadline_display,
+            task.description,
+            task.url,
+            tuple(
+                (s.get('id'), s.get('completed'), s.get('name'),
+                 s.get('description'), s.get('url'))
+                for s in (task.subtasks or [])
+            ),
+        ))
+
+    def _header_lines(self, task) -> tuple:
+        """Fixed task fields shown at the top of the starter message."""
         desc = task.description or '*No description*'
         if is_paste_url(desc):
-            desc_display = f"[View full description]({desc})"
-        else:
-            desc_display = desc
-
-        importance_label = self.IMPORTANCE_LABELS.get(task.colour, task.colour)
-        lines = [
+            desc = f"[View full description]({desc})"
+        header = (
             f"**Status:** {task.status}",
-            f"**Importance:** {priority_emoji} {importance_label}",
+            f"**Importance:** {self._priority_emoji(task.colour)} "
+            f"{self.IMPORTANCE_LABELS.get(task.colour, task.colour)}",
             f"**Owner:** {task.owner or 'Unassigned'}",
             f"**Deadline:** {task.deadline_display or 'None'}",
             "",
-            f"**Description:** {desc_display}",
-        ]
+            f"**Description:** {desc}",
+        )
         if task.url:
-            lines.append(f"**URL:** {task.url}")
-
-        # Add subtasks section with progress bar
-        if task.subtasks:
-            lines.append("")
-            lines.append(f"**Progress:** {task.progress_bar()}")
-            lines.append("")
-            lines.append("**Sub-tasks:**")
-            for idx, subtask in enumerate(task.subtasks, 1):
-                checkbox = "✅" if subtask.get('completed', False) else "☐"
-                subtask_id = subtask.get('id', idx)
-                lines.append(
-                    f"{checkbox} {subtask_id}. {subtask.get('name', 'Unnamed subtask')}")
-                subtask_desc = subtask.get('description', '')
-                if subtask_desc:
-                    if is_paste_url(subtask_desc):
-                        lines.append(f"   📝 [View description]({subtask_desc})")
-                    else:
-                        lines.append(f"   📝 {subtask_desc}")
-                if subtask.get('url'):
-                    lines.append(f"   🔗 {subtask.get('url')}")
-
-        content = "\n".join(lines)
+            return header + (f"**URL:** {task.url}",)
+        return header
+
+    @staticmethod
+    def _subtask_lines(task):
+        """Yield the progress bar and sub-task checklist lines, if any."""
+        if not task.subtasks:
+            return
+        yield ""
+        yield f"**Progress:** {task.progress_bar()}"
+        yield ""
+        yield "**Sub-tasks:**"
+        for idx, subtask in enumerate(task.subtasks, 1):
+            yield (f"{'✅' if subtask.get('completed', False) else '☐'} "
+                   f"{subtask.get('id', idx)}. {subtask.get('name', 'Unnamed subtask')}")
+            subtask_desc = subtask.get('description', '')
+            if subtask_desc:
+                if is_paste_url(subtask_desc):
+                    yield f"   📝 [View description]({subtask_desc})"
+                else:
+                    yield f"   📝 {subtask_desc}"
+            if subtask.get('url'):
+                yield f"   🔗 {subtask.get('url')}"
+
+    def _task_content(self, task):
+        task_uuid = task.uuid or task.id or task.name
+        fingerprint = self._task_fingerprint(task)
+        cached = self._content_cache.get(task_uuid)
+        if cached and cached[0] == fingerprint:
+            return cached[1]
+
+        content = "\n".join(chain(
+            self._header_lines(task), self._subtask_lines(task)))
         # Hard safety cap — should never be hit now that long descriptions go to paste
         if len(content) > _DISCORD_CONTENT_LIMIT:
             content = content[:_DISCORD_CONTENT_LIMIT - 1] + "…"
+        self._content_cache[task_uuid] = (fingerprint, content)
         return content
 
+    @staticmethod
+    def _content_hash(content: str) -> str:
+        return hashlib.blake2b(content.encode(), digest_size=16).hexdigest()
+
+    @staticmethod
+    def _view_custom_ids(task_view) -> set:
+        return {
+            item.custom_id
+            for item in task_view.children
+            if hasattr(item, 'custom_id') and item.custom_id
+        }
+
+    @staticmethod
+    @functools.lru_cache(maxsize=1024)
+    def _thread_name(colour: str, name: str) -> str:
+        # Colour and name rarely change between syncs, so most calls are hits.
+        return f"{ForumSyncService.PRIORITY_EMOJIS.get(colour, '⚪')} {name}"
+
     def _get_thread_name(self, task):
         """Generate forum thread name with priority emoji prefix for search filtering."""
-        return f"{self._priority_emoji(task.colour)} {task.name}"
+        return self._thread_name(task.colour, task.name)
 
     def _task_sort_key(self, task):
         """Sort key for forum sync ordering without priority/status weighting."""
@@ -129,19 +255,222 @@ class ForumSyncService:
         )
         return content[: _DISCORD_CONTENT_LIMIT - 1] + "…"
 
-    async def sync_from_database(self):
+    async def _bounded(self, sem: asyncio.Semaphore, coro, log_ctx: str):
+        """Await *coro* under *sem*, logging instead of raising on failure so a
+        single bad thread doesn't abort the rest of a gathered batch."""
+        async with sem:
+            try:
+                return await coro
+            except discord.Forbidden as e:
+                logger.warning(f"{log_ctx}: missing permissions: {e}")
+            except Exception as e:
+                logger.warning(f"{log_ctx}: {e}")
+        return None
+
+    async def _fetch_thread(self, thread_id, task_name: str):
+        """Fetch an uncached/archived thread directly from the API."""
+        try:
+            thread = await self._bot.fetch_channel(thread_id)
+        except Exception as e:
+            logger.warning(
+                f"Could not fetch thread {thread_id} for task '{task_name}': {e}")
+            return None
+        # Discord auto-archives inactive forum threads. Un-archive now so
+        # that fetch_message + edit work without hitting permission errors,
+        # and so the thread reappears in the active forum view.
+        if isinstance(thread, discord.Thread) and thread.archived:
+            try:
+                await thread.edit(archived=False)
+                logger.info(
+                    f"Un-archived thread {thread_id} for task '{task_name}'")
+            except Exception as unarchive_err:
+                logger.warning(
+                    f"Could not un-archive thread {thread_id} for task "
+                    f"'{task_name}': {unarchive_err}")
+        return thread
+
+    async def _remove_thread(self, thread, log_ctx: str) -> bool:
+        """Delete *thread*, falling back to archiving + locking it so it still
+        disappears from the default forum view without Manage Threads.
+
+        Returns True if the thread was deleted or archived.
+        """
+        try:
+            await thread.delete()
+            logger.info(f"{log_ctx}: deleted forum thread {thread.id}")
+            return True
+        except discord.Forbidden:
+            try:
+                await thread.edit(archived=True, locked=True)
+                logger.info(f"{log_ctx}: archived forum thread {thread.id}")
+                return True
+            except Exception as archive_err:
+                logger.warning(
+                    f"{log_ctx}: could not delete or archive thread {thread.id}: "
+                    f"{archive_err}. Grant Manage Threads to the bot.")
+        except Exception as e:
+            logger.warning(f"{log_ctx}: failed to delete thread {thread.id}: {e}")
+        return False
+
+    async def _remove_mapped_thread(self, task_uuid: str, thread_id, thread, log_ctx: str) -> bool:
+        """Remove a mapped thread and clear its mapping on success."""
+        removed = await self._remove_thread(thread, log_ctx)
+        # Only clear the mapping when the thread was actually removed.
+        if removed:
+            self.task_to_thread.pop(task_uuid, None)
+            self.thread_to_task.pop(thread_id, None)
+        return removed
+
+    async def _create_threads(self, sem: asyncio.Semaphore, forum_channel, pending) -> bool:
+        """Create forum threads for new tasks one at a time so posts keep task order."""
+        created_any = False
+        for task, task_uuid, task_view in pending:
+            content = self._safe_discord_content(
+                self._task_content(task),
+                task.name,
+            )
+            async with sem:
+                try:
+                    created = await forum_channel.create_thread(
+                        name=self._get_thread_name(task),
+                        content=content,
+                        view=task_view,
+                    )
+                except Exception as e:
+                    logger.warning(
+                        f"Failed to create forum thread for task '{task.name}': {e}")
+                    continue
+            thread = created.thread
+            self.content_hashes[thread.id] = self._content_hash(content)
+            self.view_versions[thread.id] = TASK_VIEW_VERSION
+            self.task_to_thread[task_uuid] = thread.id
+            self.thread_to_task[thread.id] = task_uuid
+            created_any = True
+            logger.info(
+                f"Created forum thread for task '{task.name}' ({task_uuid})")
+        return created_any
+
+    async def _update_thread(self, task, thread: discord.Thread, task_view,
+                             expected_id_templates: tuple) -> bool:
+        """Bring an existing thread's name and starter message up to date.
+
+        *expected_id_templates* holds the TaskView custom_ids built for
+        ``_PROBE_UUID`` without and with subtasks.
+
+        Returns True when the thread's stored content hash changed, False when
+        it was already up to date, and None when it could not be updated.
+        """
+        thread_name = self._get_thread_name(task)
+        if thread.name != thread_name:
+            try:
+                await thread.edit(name=thread_name)
+            except discord.Forbidden:
+                logger.warning(
+                    "Missing permission to rename forum posts. Grant Manage Threads to keep names synced.")
+            except Exception as e:
+                logger.warning(
+                    f"Failed to update thread metadata for {thread.id}: {e}")
+
+        # Keep latest task snapshot in thread starter message where possible
+        content = self._safe_discord_content(
+            self._task_content(task),
+            task.name,
+        )
+        content_hash = self._content_hash(content)
+        view_current = self.view_versions.get(thread.id) == TASK_VIEW_VERSION
+        # The starter message already holds exactly this content and view —
+        # skip the fetch_message round-trip entirely.
+        if view_current and self.content_hashes.get(thread.id) == content_hash:
+            return False
+
+        try:
+            starter_message = await thread.fetch_message(thread.id)
+            has_components = bool(starter_message.components)
+
+            # Detect view layout changes (e.g. new buttons added) by
+            # comparing expected custom_ids against those on the message.
+            # Skipped when the last attached view is the current layout version.
+            view_changed = False
+            if not view_current:
+                actual_ids = set()
+                for row in starter_message.components:
+                    for child in row.children:
+                        if hasattr(child, 'custom_id') and child.custom_id:
+                            actual_ids.add(child.custom_id)
+                task_uuid = task_view.task_uuid
+                view_changed = actual_ids != {
+                    cid.replace(_PROBE_UUID, task_uuid)
+                    for cid in expected_id_templates[bool(task.subtasks)]
+                }
+
+            if starter_message.content != content or not has_components or view_changed:
+                await starter_message.edit(content=content, view=task_view)
+            self.content_hashes[thread.id] = content_hash
+            self.view_versions[thread.id] = TASK_VIEW_VERSION
+            return True
+        except discord.NotFound:
+            # Starter message was deleted externally — post a replacement.
+            logger.warning(
+                f"Starter message for task '{task.name}' (thread {thread.id}) not found; "
+                "posting replacement.")
+            await thread.send(content, view=task_view)
+        except Exception as e:
+            # Any other error (permissions, rate limit, archived state, etc.) —
+            # log it but do NOT send a new message. Sending blindly here is what
+            # causes duplicate posts when fetch_message fails transiently.
+            logger.warning(
+                f"Could not update starter message for task '{task.name}' "
+                f"(thread {thread.id}): {e}")
+        return None
+
+    async def _fetch_orphan_thread(self, mapped_thread_id: int):
+        """Fetch the uncached thread of an externally-deleted task, or None if unreachable."""
+        try:
+            return await self._bot.fetch_channel(mapped_thread_id)
+        except discord.NotFound:
+            logger.warning(f"Orphan cleanup: channel {mapped_thread_id} not found")
+        except discord.Forbidden:
+            logger.error(f"Orphan cleanup: missing permissions for channel {mapped_thread_id}")
+        except Exception as e:
+            logger.error(f"Orphan cleanup: unexpected error fetching channel {mapped_thread_id}: {e}", exc_info=True)
+        return None
+
+    async def _cleanup_orphan(self, mapped_uuid: str, mapped_thread_id, orphan_thread) -> bool:
+        """Remove the thread of a task deleted externally.
+
+        Returns True when the mapping can be dropped (thread removed or already gone).
+        """
+        if isinstance(orphan_thread, discord.Thread):
+            removed = await self._remove_thread(
+                orphan_thread,
+                f"Orphan cleanup (externally-removed task '{mapped_uuid}')")
+        else:
+            # Thread already gone — just clean up the stale mapping.
+            removed = True
+            logger.debug(
+                f"Orphan cleanup: thread {mapped_thread_id} for task "
+                f"'{mapped_uuid}' no longer exists; removing stale mapping.")
+        return removed
+
+    async def sync_from_database(self, save_mappings: bool = True) -> bool:
+        """Bring the forum threads in line with the database.
+
+        Returns True if the mappings changed. With save_mappings=False the
+        caller is responsible for persisting them (see sync_and_drain_log_events).
+        """
         if not self._bot or Settings.TASK_FORUM_CHANNEL is None:
-            return
+            return False
 
         # Reload mappings from database to avoid race conditions when multiple
-        # service instances (modal/button handlers) create threads concurrently
-        self._load_mappings()
+        # service instances (modal/button handlers) create threads concurrently.
+        # The version check skips the full read when nobody else has saved.
+        self._refresh_mappings()
 
         forum_channel = self._bot.get_channel(Settings.TASK_FORUM_CHANNEL)
         if not isinstance(forum_channel, discord.ForumChannel):
             logger.warning(
                 f"Channel {Settings.TASK_FORUM_CHANNEL} is not a forum channel")
-            return
+            return False
 
         from services.task_service import TaskService
         from discord_ui.buttons import TaskView
@@ -149,6 +478,22 @@ class ForumSyncService:
         tasks = await task_service.get_all_tasks()
         tasks = sorted(tasks, key=self._task_sort_key)
 
+        # Tasks carry no updated_at, so fingerprint everything the sync reads:
+        # task fields, mappings and view versions, and the cached threads. If
+        # none of it moved since a sync that found nothing to do, skip the
+        # whole procedure (including the fetch_active_threads call).
+        fingerprint = self._task_fingerprint
+        sync_signature = (
+            self._mappings_version,
+            TASK_VIEW_VERSION,
+            hash(tuple((t.uuid or t.id or t.name, t.name, fingerprint(t)) for t in tasks)),
+            hash(frozenset((t.id, t.name, t.archived) for t in forum_channel.threads)),
+        )
+        if self._mappings_version is not None and sync_signature == self._last_sync_signature:
+            logger.debug("Forum sync: nothing changed since last sync; skipping.")
+            return False
+        self._last_sync_signature = None
+
         # Build a lookup of all active forum threads keyed by thread id for fast access.
         # This avoids relying solely on get_channel (which skips uncached threads).
         live_threads: dict[int, discord.Thread] = {
@@ -169,262 +514,252 @@ class ForumSyncService:
 
         # Build a fast uuid->task lookup for the reverse-scan step below.
         uuid_to_task = {(t.uuid or t.id or t.name): t for t in tasks}
+        task_uuids_in_db = uuid_to_task.keys()
 
+        # Discord API calls are dispatched in concurrent batches; the semaphore
+        # keeps the number in flight low enough to stay clear of rate limits.
+        sem = asyncio.Semaphore(_SYNC_CONCURRENCY)
         mappings_changed = False
 
+        # Bind attributes used once per task/thread below to locals.
+        task_to_thread = self.task_to_thread
+        thread_to_task = self.thread_to_task
+        add_view = self._bot.add_view
+        view_cache = self._view_cache
+        bounded = self._bounded
+        Thread = discord.Thread
+        log_warning = logger.warning
+        log_debug = logger.debug
+
+        # Pass 1: resolve each task's mapped thread id, then fetch every mapped
+        # thread missing from the live cache (including orphans) in a single batch.
+        plan = []
         for task in tasks:
             # Keep migration-safe fallback for legacy tasks while UUID backfill propagates.
             task_uuid = task.uuid or task.id or task.name
             if not task.uuid:
-                logger.warning(
+                log_warning(
                     f"Task '{task.name}' missing UUID during forum sync; using legacy fallback key.")
-            thread = None
-            thread_id = self.task_to_thread.get(task_uuid)
+            thread_id = task_to_thread.get(task_uuid)
 
             # Migrate old mapping keys (name/id) to UUID to avoid duplicate thread creation.
             if not thread_id:
-                for legacy_key in [task.id, task.name]:
-                    if legacy_key and legacy_key in self.task_to_thread:
-                        thread_id = self.task_to_thread.pop(legacy_key)
-                        self.task_to_thread[task_uuid] = thread_id
-                        self.thread_to_task[str(thread_id)] = task_uuid
-                        mappings_changed = True
-                        break
+                thread_id = (task_to_thread.pop(task.id, None)
+                             or task_to_thread.pop(task.name, None))
+                if thread_id:
+                    task_to_thread[task_uuid] = thread_id
+                    thread_to_task[thread_id] = task_uuid
+                    mappings_changed = True
+            plan.append((task, task_uuid, thread_id))
+
+        # Orphans: mapped tasks that were deleted externally (e.g. via the web
+        # app). They no longer appear in the DB, so the per-task passes never
+        # touch their threads. Decisions are collected here and the mapping
+        # pops applied in one pass once the removals have finished.
+        pending_deletes: list[tuple[str, int]] = [
+            (mapped_uuid, mapped_thread_id)
+            for mapped_uuid, mapped_thread_id in tuple(task_to_thread.items())
+            if mapped_uuid not in task_uuids_in_db
+        ]
 
+        to_fetch = {
+            thread_id: task.name
+            for task, _, thread_id in plan
+            if thread_id and not isinstance(live_threads.get(thread_id), Thread)
+        }
+        orphans_to_fetch = [
+            mapped_thread_id for _, mapped_thread_id in pending_deletes
+            if not isinstance(live_threads.get(mapped_thread_id), Thread)
+        ]
+        fetched = await asyncio.gather(
+            *(bounded(sem, self._fetch_thread(thread_id, task_name),
+                      f"Fetching thread {thread_id}")
+              for thread_id, task_name in to_fetch.items()),
+            *(bounded(sem, self._fetch_orphan_thread(thread_id),
+                      f"Fetching orphan thread {thread_id}")
+              for thread_id in orphans_to_fetch),
+            return_exceptions=True,
+        )
+        fetched_threads = dict(zip(to_fetch, fetched))
+        fetched_orphans = dict(zip(orphans_to_fetch, fetched[len(to_fetch):]))
+
+        # Pass 2: queue per-task work (delete/update) and run it concurrently.
+        # The TaskView layout only depends on whether a task has subtasks, so
+        # the expected custom_ids are built once here and the uuid substituted.
+        expected_id_templates = (
+            frozenset(self._view_custom_ids(TaskView(task_uuid=_PROBE_UUID, subtasks=[]))),
+            frozenset(self._view_custom_ids(TaskView(task_uuid=_PROBE_UUID, subtasks=[{"id": 0}]))),
+        )
+        # Thread creation is chained into a single job so new posts keep task order.
+        work = []
+        to_create = []
+        for task, task_uuid, thread_id in plan:
+            thread = None
             if thread_id:
-                thread = live_threads.get(int(thread_id))
-                if not isinstance(thread, discord.Thread):
-                    # Fall back to a direct API fetch for uncached/archived threads.
-                    try:
-                        thread = await self._bot.fetch_channel(int(thread_id))
-                        # Discord auto-archives inactive forum threads. Un-archive now so
-                        # that fetch_message + edit work without hitting permission errors,
-                        # and so the thread reappears in the active forum view.
-                        if isinstance(thread, discord.Thread) and thread.archived:
-                            try:
-                                await thread.edit(archived=False)
-                                logger.info(
-                                    f"Un-archived thread {thread_id} for task '{task.name}'")
-                            except Exception as unarchive_err:
-                                logger.warning(
-                                    f"Could not un-archive thread {thread_id} for task "
-                                    f"'{task.name}': {unarchive_err}")
-                    except Exception as e:
-                        logger.warning(
-                            f"Could not fetch thread {thread_id} for task '{task.name}': {e}")
-                        thread = None
+                thread = live_threads.get(thread_id)
+                if not isinstance(thread, Thread):
+                    thread = fetched_threads.get(thread_id)
 
             # If the task is complete, hide its forum thread and skip it.
             if task.status == "Complete":
-                removed = False
-                if isinstance(thread, discord.Thread):
-                    try:
-                        await thread.delete()
-                        logger.info(
-                            f"Deleted forum thread for completed task '{task.name}' ({task_uuid})")
-                        removed = True
-                    except discord.Forbidden:
-                        # Fall back to archiving + locking so the thread disappears
-                        # from the default forum view even without Manage Threads.
-                        try:
-                            await thread.edit(archived=True, locked=True)
-                            logger.info(
-                                f"Archived forum thread for completed task '{task.name}' ({task_uuid})")
-                            removed = True
-                        except Exception as archive_err:
-                            logger.warning(
-                                f"Could not delete or archive thread for completed task '{task.name}': "
-                                f"{archive_err}. Grant Manage Threads to the bot.")
-                    except Exception as e:
-                        logger.warning(
-                            f"Failed to delete thread for completed task '{task.name}': {e}")
+                if isinstance(thread, Thread):
+                    work.append(bounded(
+                        sem,
+                        self._remove_mapped_thread(
+                            task_uuid, thread_id, thread,
+                            f"Completed task '{task.name}' ({task_uuid})"),
+                        f"Removing thread for completed task '{task.name}'"))
                 elif thread_id:
                     # Mapping existed but thread could not be found (deleted externally?).
                     # Treat as successfully removed so we clean up the stale mapping.
-                    removed = True
-                    logger.debug(
+                    log_debug(
                         f"Thread {thread_id} for completed task '{task.name}' no longer exists; "
                         "cleaning stale mapping.")
-                # else: no mapping and no thread — nothing to do.
-
-                # Only clear the mapping when the thread was actually removed.
-                if removed:
-                    self.task_to_thread.pop(task_uuid, None)
-                    if thread_id:
-                        self.thread_to_task.pop(str(thread_id), None)
+                    task_to_thread.pop(task_uuid, None)
+                    thread_to_task.pop(thread_id, None)
                     mappings_changed = True
+                # else: no mapping and no thread — nothing to do.
                 continue
 
             # Build a persistent TaskView for this task and register it so button
-            # interactions survive bot restarts.
-            task_view = TaskView(task_uuid=task_uuid,
-                                 subtasks=task.subtasks or [])
-            self._bot.add_view(task_view)
-
-            if not isinstance(thread, discord.Thread):
-                thread_name = self._get_thread_name(task)
-                thread_content = self._safe_discord_content(
-                    self._task_content(task),
-                    task.name,
-                )
-                created = await forum_channel.create_thread(
-                    name=thread_name,
-                    content=thread_content,
-                    view=task_view,
-                )
-                thread = created.thread
-                self.task_to_thread[task_uuid] = str(thread.id)
-                self.thread_to_task[str(thread.id)] = task_uuid
-                mappings_changed = True
-                logger.info(
-                    f"Created forum thread for task '{task.name}' ({task_uuid})")
+            # interactions survive bot restarts. The view only depends on the
+            # subtasks shown in the select, so unchanged tasks reuse theirs.
+            subtasks = task.subtasks or []
+            view_sig = tuple(
+                (st.get("id"), st.get("name"), st.get("completed")) for st in subtasks)
+            cached_view = view_cache.get(task_uuid)
+            if cached_view and cached_view[0] == view_sig:
+                task_view = cached_view[1]
+            else:
+                task_view = TaskView(task_uuid=task_uuid, subtasks=subtasks)
+                add_view(task_view)
+                view_cache[task_uuid] = (view_sig, task_view)
+
+            if not isinstance(thread, Thread):
+                to_create.append((task, task_uuid, task_view))
                 continue
 
-            thread_name = self._get_thread_name(task)
-            if thread.name != thread_name:
-                try:
-                    await thread.edit(name=thread_name)
-                except discord.Forbidden:
-                    logger.warning(
-                        "Missing permission to rename forum posts. Grant Manage Threads to keep names synced.")
-                except Exception as e:
-                    logger.warning(
-                        f"Failed to update thread metadata for {thread.id}: {e}")
+            work.append(bounded(
+                sem,
+                self._update_thread(task, thread, task_view, expected_id_templates),
+                f"Updating thread {thread.id} for task '{task.name}'"))
 
-            # Keep latest task snapshot in thread starter message where possible
-            content = self._safe_discord_content(
-                self._task_content(task),
-                task.name,
-            )
-            try:
-                starter_message = await thread.fetch_message(thread.id)
-                has_components = bool(starter_message.components)
-
-                # Detect view layout changes (e.g. new buttons added) by
-                # comparing expected custom_ids against those on the message.
-                expected_ids = {
-                    item.custom_id
-                    for item in task_view.children
-                    if hasattr(item, 'custom_id') and item.custom_id
-                }
-                actual_ids = set()
-                for row in starter_message.components:
-                    for child in row.children:
-                        if hasattr(child, 'custom_id') and child.custom_id:
-                            actual_ids.add(child.custom_id)
-                view_changed = expected_ids != actual_ids
+        if to_create:
+            work.append(self._create_threads(sem, forum_channel, to_create))
+        results = await asyncio.gather(*work, return_exceptions=True)
+        mappings_changed |= any(r is True for r in results)
+        # Only a sync in which every thread was already up to date may be
+        # skipped next time; anything fetched, created, changed or failed
+        # (None / exception results) must be retried.
+        idle = (not fetched and not to_create and not mappings_changed
+                and all(r is False for r in results))
 
-                if starter_message.content != content or not has_components or view_changed:
-                    await starter_message.edit(content=content, view=task_view)
-            except discord.NotFound:
-                # Starter message was deleted externally — post a replacement.
-                logger.warning(
-                    f"Starter message for task '{task.name}' (thread {thread.id}) not found; "
-                    "posting replacement.")
-                await thread.send(content, view=task_view)
-            except Exception as e:
-                # Any other error (permissions, rate limit, archived state, etc.) —
-                # log it but do NOT send a new message. Sending blindly here is what
-                # causes duplicate posts when fetch_message fails transiently.
-                logger.warning(
-                    f"Could not update starter message for task '{task.name}' "
-                    f"(thread {thread.id}): {e}")
+        # Pass 3: batch the cleanup deletions.
+        cleanup = []
 
         # Reverse-scan: delete any live forum threads whose mapped task is now Complete
         # (catches threads that slipped through the main loop due to missing/stale mappings).
-        for thread_id_int, thread in list(live_threads.items()):
-            mapped_uuid = self.thread_to_task.get(str(thread_id_int))
+        for thread_id, thread in live_threads.items():
+            mapped_uuid = thread_to_task.get(thread_id)
             if not mapped_uuid:
                 continue
             mapped_task = uuid_to_task.get(mapped_uuid)
             if mapped_task and mapped_task.status == "Complete":
-                removed = False
-                try:
-                    await thread.delete()
-                    logger.info(
-                        f"Reverse-scan: deleted forum thread {thread_id_int} "
-                        f"for completed task '{mapped_task.name}'")
-                    removed = True
-                except discord.Forbidden:
-                    try:
-                        await thread.edit(archived=True, locked=True)
-                        logger.info(
-                            f"Reverse-scan: archived forum thread {thread_id_int} "
-                            f"for completed task '{mapped_task.name}'")
-                        removed = True
-                    except Exception as archive_err:
-                        logger.warning(
-                            f"Reverse-scan: could not delete or archive thread {thread_id_int}: "
-                            f"{archive_err}")
-                except Exception as e:
-                    logger.warning(
-                        f"Reverse-scan: failed to delete thread {thread_id_int}: {e}")
-                if removed:
-                    self.task_to_thread.pop(mapped_uuid, None)
-                    self.thread_to_task.pop(str(thread_id_int), None)
-                    mappings_changed = True
-
-        # Orphan cleanup: remove threads for tasks that were deleted externally
-        # (e.g. via the web app). These tasks no longer appear in the DB at all,
-        # so the main loop above never touches their threads.
-        task_uuids_in_db = set(uuid_to_task.keys())
-        for mapped_uuid, mapped_thread_id in list(self.task_to_thread.items()):
-            if mapped_uuid in task_uuids_in_db:
-                continue
-            # This mapped task no longer exists in the DB — clean up its thread.
-            orphan_thread = live_threads.get(int(mapped_thread_id))
-            if not orphan_thread:
-                try:
-                    orphan_thread = await self._bot.fetch_channel(int(mapped_thread_id))
-                except discord.NotFound:
-                    logger.warning(f"Orphan cleanup: channel {mapped_thread_id} not found")
-                    orphan_thread = None
-                except discord.Forbidden:
-                    logger.error(f"Orphan cleanup: missing permissions for channel {mapped_thread_id}")
-                    orphan_thread = None
-                except Exception as e:
-                    logger.error(f"Orphan cleanup: unexpected error fetching channel {mapped_thread_id}: {e}", exc_info=True)
-                    orphan_thread = None
-
-            removed = False
-            if isinstance(orphan_thread, discord.Thread):
-                try:
-                    await orphan_thread.delete()
-                    logger.info(
-                        f"Orphan cleanup: deleted thread {mapped_thread_id} "
-                        f"for externally-removed task '{mapped_uuid}'")
-                    removed = True
-                except discord.Forbidden:
-                    try:
-                        await orphan_thread.edit(archived=True, locked=True)
-                        logger.info(
-                            f"Orphan cleanup: archived thread {mapped_thread_id} "
-                            f"for externally-removed task '{mapped_uuid}'")
-                        removed = True
-                    except Exception as archive_err:
-                        logger.warning(
-                            f"Orphan cleanup: could not delete/archive thread "
-                            f"{mapped_thread_id}: {archive_err}")
-                except Exception as e:
-                    logger.warning(
-                        f"Orphan cleanup: failed to delete thread "
-                        f"{mapped_thread_id}: {e}")
-            else:
-                # Thread already gone — just clean up the stale mapping.
-                removed = True
-                logger.debug(
-                    f"Orphan cleanup: thread {mapped_thread_id} for task "
-                    f"'{mapped_uuid}' no longer exists; removing stale mapping.")
-
-            if removed:
-                self.task_to_thread.pop(mapped_uuid, None)
-                self.thread_to_task.pop(str(mapped_thread_id), None)
-                mappings_changed = True
+                cleanup.append(bounded(
+                    sem,
+                    self._remove_mapped_thread(
+                        mapped_uuid, thread_id, thread,
+                        f"Reverse-scan (completed task '{mapped_task.name}')"),
+                    f"Reverse-scan: thread {thread_id}"))
+
+        # Orphan cleanup: remove threads for tasks that were deleted externally.
+        for mapped_uuid, mapped_thread_id in pending_deletes:
+            cleanup.append(bounded(
+                sem,
+                self._cleanup_orphan(
+                    mapped_uuid, mapped_thread_id,
+                    live_threads.get(mapped_thread_id)
+                    or fetched_orphans.get(mapped_thread_id)),
+                f"Orphan cleanup: thread {mapped_thread_id}"))
+
+        results = await asyncio.gather(*cleanup, return_exceptions=True)
+        mappings_changed |= any(r is True for r in results)
+
+        # Orphan results are the tail of the gather, in pending_deletes order.
+        orphan_results = results[len(results) - len(pending_deletes):]
+        for (mapped_uuid, mapped_thread_id), removed in zip(pending_deletes, orphan_results):
+            if removed is True:
+                task_to_thread.pop(mapped_uuid, None)
+                thread_to_task.pop(mapped_thread_id, None)
+
+        # Drop rendered content and cached views for tasks that no longer exist.
+        for stale_uuid in self._content_cache.keys() - uuid_to_task.keys():
+            del self._content_cache[stale_uuid]
+        for stale_uuid in view_cache.keys() - uuid_to_task.keys():
+            del view_cache[stale_uuid]
 
         # Persist mapping changes once at the end to avoid redundant writes.
-        if mappings_changed:
+        if mappings_changed and save_mappings:
             self._save_mappings()
 
+        if idle and not cleanup and not mappings_changed:
+            self._last_sync_signature = sync_signature
+        return mappings_changed
+
+    def _log_event_handlers(self, log_svc) -> dict:
+        """Map pending log event types to adapters that call the logging service."""
+        if self._log_handlers is None:
+            created = log_svc.log_task_created_externally
+            updated = log_svc.log_task_updated_externally
+            deleted = log_svc.log_task_deleted_externally
+            subtask_added = log_svc.log_subtask_added_externally
+            subtask_edited = log_svc.log_subtask_edited_externally
+            subtask_toggled = log_svc.log_subtask_toggled_externally
+            subtask_deleted = log_svc.log_subtask_deleted_externally
+            self._log_handlers = {
+                "task_created": lambda e: created(
+                    source=e.get("source", "External"),
+                    task_name=e.get("task_name", "Unknown"),
+                    task_after=e.get("after", {}),
+                ),
+                "task_updated": lambda e: updated(
+                    source=e.get("source", "External"),
+                    task_name=e.get("task_name", "Unknown"),
+                    before=e.get("before", {}),
+                    after=e.get("after", {}),
+                ),
+                "task_deleted": lambda e: deleted(
+                    source=e.get("source", "External"),
+                    task_name=e.get("task_name", "Unknown"),
+                ),
+                "subtask_added": lambda e: subtask_added(
+                    source=e.get("source", "External"),
+                    task_name=e.get("task_name", "Unknown"),
+                    subtask=e.get("subtask", {}),
+                ),
+                "subtask_edited": lambda e: subtask_edited(
+                    source=e.get("source", "External"),
+                    task_name=e.get("task_name", "Unknown"),
+                    subtask_id=e.get("subtask_id", 0),
+                    before=e.get("before", {}),
+                    after=e.get("after", {}),
+                ),
+                "subtask_toggled": lambda e: subtask_toggled(
+                    source=e.get("source", "External"),
+                    task_name=e.get("task_name", "Unknown"),
+                    subtask_id=e.get("subtask_id", 0),
+                    subtask_name=e.get("subtask", {}).get("name", "Unknown"),
+                    completed=e.get("subtask", {}).get("completed", False),
+                ),
+                "subtask_deleted": lambda e: subtask_deleted(
+                    source=e.get("source", "External"),
+                    task_name=e.get("task_name", "Unknown"),
+                    subtask_id=e.get("subtask_id", 0),
+                    subtask_name=e.get("subtask", {}).get("name", "Unknown"),
+                ),
+            }
+        return self._log_handlers
+
     async def drain_log_events(self, username: str):
         """Drain pending log events from the database and dispatch to logging service."""
         if not self._db:
@@ -433,88 +768,84 @@ class ForumSyncService:
             events = self._db.get_pending_log_events(username)
             if not events:
                 return
+            await self._dispatch_log_events(events)
+            self._db.clear_pending_log_events(username)
+            logger.debug(
+                f"Drained {len(events)} pending log event(s) for user {username}")
+        except Exception as e:
+            logger.warning(f"Error draining log events: {e}")
 
-            from services.logging_service import get_logging_service
-            log_svc = get_logging_service()
-
-            for event in events:
-                try:
-                    etype = event.get("event_type", "")
-                    source = event.get("source", "External")
-                    task_name = event.get("task_name", "Unknown")
-
-                    if etype == "task_created":
-                        await log_svc.log_task_created_externally(
-                            source=source,
-                            task_name=task_name,
-                            task_after=event.get("after", {}),
-                        )
-                    elif etype == "task_updated":
-                        await log_svc.log_task_updated_externally(
-                            source=source,
-                            task_name=task_name,
-                            before=event.get("before", {}),
-                            after=event.get("after", {}),
-                        )
-                    elif etype == "task_deleted":
-                        await log_svc.log_task_deleted_externally(
-                            source=source,
-                            task_name=task_name,
-                        )
-                    elif etype == "subtask_added":
-                        await log_svc.log_subtask_added_externally(
-                            source=source,
-                            task_name=task_name,
-                            subtask=event.get("subtask", {}),
-                        )
-                    elif etype == "subtask_edited":
-                        await log_svc.log_subtask_edited_externally(
-                            source=source,
-                            task_name=task_name,
-                            subtask_id=event.get("subtask_id", 0),
-                            before=event.get("before", {}),
-                            after=event.get("after", {}),
-                        )
-                    elif etype == "subtask_toggled":
-                        await log_svc.log_subtask_toggled_externally(
-                            source=source,
-                            task_name=task_name,
-                            subtask_id=event.get("subtask_id", 0),
-                            subtask_name=event.get(
-                                "subtask", {}).get("name", "Unknown"),
-                            completed=event.get("subtask", {}).get(
-                                "completed", False),
-                        )
-                    elif etype == "subtask_deleted":
-                        await log_svc.log_subtask_deleted_externally(
-                            source=source,
-                            task_name=task_name,
-                            subtask_id=event.get("subtask_id", 0),
-                            subtask_name=event.get(
-                                "subtask", {}).get("name", "Unknown"),
-                        )
-                    else:
-                        logger.warning(f"Unknown log event type: {etype}")
-                except Exception as exc:
-                    logger.warning(
-                        f"Failed to process log event {event.get('id', '?')}: {exc}")
+    async def sync_and_drain_log_events(self, username: str):
+        """sync_from_database followed by drain_log_events, with the mapping save
+        and the log-event clear committed as one write straight after the sync.
 
+        Other service instances (modal/button handlers) see the new mappings
+        before any log embeds are dispatched. The logging service only queues
+        the embeds, so clearing the events before dispatch loses nothing a
+        clear after dispatch would have kept.
+        """
+        mappings_changed = await self.sync_from_database(save_mappings=False)
+        if not self._db:
+            return
+        try:
+            events = self._db.get_pending_log_events(username)
+        except Exception as e:
+            logger.warning(f"Error reading log events: {e}")
+            events = []
+        if mappings_changed:
+            if not self._save_mappings(clear_log_events_for=username if events else None):
+                # The events are still queued; the next tick drains them.
+                return
+        elif events:
             self._db.clear_pending_log_events(username)
+        if not events:
+            return
+        try:
+            await self._dispatch_log_events(events)
             logger.debug(
                 f"Drained {len(events)} pending log event(s) for user {username}")
         except Exception as e:
             logger.warning(f"Error draining log events: {e}")
 
+    async def _dispatch_log_events(self, events: list):
+        """Hand pending log events to the logging service."""
+        from services.logging_service import get_logging_service
+        handlers = self._log_event_handlers(get_logging_service())
+
+        # Events for the same task are dispatched in order; different tasks
+        # run concurrently, capped by the semaphore.
+        groups = defaultdict(list)
+        for event in events:
+            groups[event.get("task_name")].append(event)
+        sem = asyncio.Semaphore(_DRAIN_CONCURRENCY)
+
+        async def _run_group(group):
+            async with sem:
+                for event in group:
+                    try:
+                        etype = event.get("event_type", "")
+                        handler = handlers.get(etype)
+                        if handler:
+                            await handler(event)
+                        else:
+                            logger.warning(f"Unknown log event type: {etype}")
+                    except Exception as exc:
+                        logger.warning(
+                            f"Failed to process log event {event.get('id', '?')}: {exc}")
+
+        async with asyncio.TaskGroup() as tg:
+            for group in groups.values():
+                tg.create_task(_run_group(group))
+
     async def handle_thread_rename(self, thread: discord.Thread):
         """Sync thread title changes back to database task name"""
         task_uuid = self.get_task_uuid_for_thread(thread.id)
         if not task_uuid:
             return
         thread_name = thread.name
-        for emoji in set(self.PRIORITY_EMOJIS.values()):
-            prefix = f"{emoji} "
+        for prefix, n in self._PREFIX_STRIP:
             if thread_name.startswith(prefix):
-                thread_name = thread_name[len(prefix):]
+                thread_name = thread_name[n:]
                 break
         from services.task_service import TaskService
         from services.logging_service import get_logging_service
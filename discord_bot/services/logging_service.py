@@ -5,12 +5,16 @@ Sends structured embeds to a configurable LOG_CHANNEL whenever a user
 performs an action through the bot (task configure, subtask add/edit/
 toggle/delete, task rename).
 """
+import asyncio
 import logging
+import time
 import discord
+from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Optional, Union
+from typing import Final, Optional, Union
 
-from services.paste_service import upload_to_paste
+from config.settings import Settings
+from services.paste_service import async_upload_to_paste
 
 logger = logging.getLogger(__name__)
 
@@ -20,6 +24,20 @@ _MAX_DESCRIPTION_PREVIEW = 512
 _MAX_FIELD_VALUE = 1024
 # Threshold above which we push to koda-paste instead of inline.
 _PASTE_THRESHOLD = 500
+# Characters _format_diff_value adds around the before/after values inline.
+_DIFF_INLINE_OVERHEAD = len("**Before:** \n**After:** ")
+# Discord limits per message: at most 10 embeds, 6000 embed characters in total.
+_MAX_EMBEDS_PER_MESSAGE = 10
+_MAX_EMBED_CHARS_PER_MESSAGE = 6000
+# Attempts per batch when the log channel keeps answering 429.
+_SEND_ATTEMPTS = 3
+# Embeds held for sending at most; further events are dropped and counted so a
+# Discord outage or a spam burst can't grow the backlog without bound.
+_QUEUE_MAXSIZE = 200
+# Minimum seconds between "events dropped" notices in the log channel.
+_DROP_REPORT_INTERVAL = 30
+# Seconds a subtask edit waits in the queue for follow-up edits to merge with.
+_EDIT_COALESCE_WINDOW = 2.0
 
 
 def _trunc(value: str, limit: int = _MAX_FIELD_VALUE) -> str:
@@ -29,75 +47,425 @@ def _trunc(value: str, limit: int = _MAX_FIELD_VALUE) -> str:
     return value if len(value) <= limit else value[: limit - 1] + "…"
 
 
-def _format_diff_value(old_val: str, new_val: str, field_name: str = "Field", task_name: str = "") -> str:
+async def _format_diff_value(old_val: str, new_val: str, field_name: str = "Field", task_name: str = "") -> str:
     """Format a before/after diff. If the combined text exceeds _PASTE_THRESHOLD,
     upload the full diff to koda-paste and return a link; otherwise return inline text."""
-    inline = f"**Before:** {old_val}\n**After:** {new_val}"
-    if len(inline) <= _PASTE_THRESHOLD:
-        return inline
+    # Size the inline form first so long diffs don't build a string only to
+    # throw it away on the paste path.
+    if len(old_val) + len(new_val) + _DIFF_INLINE_OVERHEAD <= _PASTE_THRESHOLD:
+        return f"**Before:** {old_val}\n**After:** {new_val}"
 
     # Upload full diff to koda-paste
     paste_content = f"Task: {task_name}\nField: {field_name}\n\n--- Before ---\n{old_val}\n\n--- After ---\n{new_val}"
-    paste_url = upload_to_paste(paste_content, title=f"{task_name} — {field_name} diff")
+    paste_url = await async_upload_to_paste(paste_content, title=f"{task_name} — {field_name} diff")
     if paste_url:
         preview_old = old_val[:80] + "…" if len(old_val) > 80 else old_val
         preview_new = new_val[:80] + "…" if len(new_val) > 80 else new_val
         return f"**Before:** {preview_old}\n**After:** {preview_new}\n🔗 [Full diff]({paste_url})"
     else:
-        return _trunc(inline)
-
-
-_LOG_COLORS = {
-    "create": discord.Color.green(),
-    "update": discord.Color.blue(),
-    "delete": discord.Color.red(),
-    "rename": discord.Color.gold(),
-    "toggle": discord.Color.purple(),
+        return _trunc(f"**Before:** {old_val}\n**After:** {new_val}")
+
+
+# (key, label) pairs compared by the before/after diff log methods.
+_TASK_DIFF_FIELDS = (
+    ("status", "Status"),
+    ("priority", "Priority"),
+    ("owner", "Owner"),
+    ("deadline", "Deadline"),
+    ("description", "Description"),
+    ("url", "URL"),
+)
+_TASK_DIFF_FIELDS_EXT = _TASK_DIFF_FIELDS + (("name", "Name"),)
+_SUBTASK_DIFF_FIELDS = (
+    ("name", "Name"),
+    ("description", "Description"),
+    ("url", "URL"),
+)
+
+
+def _diff_changes(fields: tuple, before: dict, after: dict) -> list:
+    """Return (label, old, new) for each field whose displayed value changed."""
+    return [
+        (label, old, new)
+        for key, label in fields
+        if (old := before.get(key) or "*empty*") != (new := after.get(key) or "*empty*")
+    ]
+
+
+@dataclass
+class _PendingDiff:
+    """A before/after diff event queued for the worker, rendered when flushed.
+
+    Later edits with the same *key* update ``after`` in place while this is
+    still queued, so a burst of edits logs one diff from the first ``before``
+    to the last ``after``.
+    """
+    key: tuple
+    title: str
+    by: str
+    footer: dict
+    task_name: str
+    fields: tuple
+    before: dict
+    after: dict
+    due: float
+
+
+# Same RGB values as discord.Color.green()/blue()/red()/gold()/purple().
+_LOG_COLORS: Final[dict[str, discord.Color]] = {
+    "create": discord.Color(0x2ecc71),
+    "update": discord.Color(0x3498db),
+    "delete": discord.Color(0xe74c3c),
+    "rename": discord.Color(0xf1c40f),
+    "toggle": discord.Color(0x9b59b6),
+    "warning": discord.Color(0xe67e22),
 }
 
 
 class LoggingService:
     """Sends human-readable audit-log embeds to a configured Discord channel."""
 
+    _CREATE_COLOR = _LOG_COLORS["create"]
+    _UPDATE_COLOR = _LOG_COLORS["update"]
+    _DELETE_COLOR = _LOG_COLORS["delete"]
+    _RENAME_COLOR = _LOG_COLORS["rename"]
+    _TOGGLE_COLOR = _LOG_COLORS["toggle"]
+    _WARNING_COLOR = _LOG_COLORS["warning"]
+
     def __init__(self):
         self._bot = None
+        self._log_channel_id: Optional[int] = None
+        # Resolved log channel, cached for the lifetime of the worker.
+        self._channel = None
+        # Embeds waiting to be sent; drained in batches by _flush_loop so bursts
+        # go out as a few multi-embed messages instead of one message each.
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=_QUEUE_MAXSIZE)
+        self._worker_task: Optional[asyncio.Task] = None
+        # Events dropped because the queue was full, not yet reported.
+        self._dropped = 0
+        self._next_drop_report = 0.0
+        # Queued subtask edits still open for coalescing, by _PendingDiff.key.
+        self._pending_edits: dict[tuple, _PendingDiff] = {}
 
     def set_bot(self, bot):
         self._bot = bot
-
-    async def _send_log(self, embed: discord.Embed):
-        from config.settings import Settings
-        if not self._bot or not Settings.LOG_CHANNEL:
+        self._log_channel_id = Settings.LOG_CHANNEL
+        self._channel = None
+        self._resolve_channel()
+        self._ensure_worker()
+
+    def _resolve_channel(self):
+        if self._bot and self._log_channel_id:
+            self._channel = self._bot.get_channel(self._log_channel_id)
+        return self._channel
+
+    def _log_enabled(self) -> bool:
+        """True when audit logs have somewhere to go; checked before building embeds."""
+        return bool(self._bot and self._log_channel_id)
+
+    def _ensure_worker(self):
+        if self._worker_task is None or self._worker_task.done():
+            try:
+                self._worker_task = asyncio.get_running_loop().create_task(self._flush_loop())
+            except RuntimeError:
+                # No running loop yet; the first _send_log will start it.
+                pass
+
+    async def _send_log(self, item: Union[discord.Embed, _PendingDiff]):
+        if not self._log_enabled():
             return
+        self._ensure_worker()
         try:
-            channel = self._bot.get_channel(Settings.LOG_CHANNEL)
-            if channel:
-                await channel.send(embed=embed)
+            self._queue.put_nowait(item)
+        except asyncio.QueueFull:
+            self._dropped += 1
+            if isinstance(item, _PendingDiff):
+                self._pending_edits.pop(item.key, None)
+
+    async def _render(self, item: Union[discord.Embed, _PendingDiff]) -> Optional[discord.Embed]:
+        if not isinstance(item, _PendingDiff):
+            return item
+        if self._pending_edits.get(item.key) is item:
+            del self._pending_edits[item.key]
+        return await self._diff_embed(
+            item.title, item.by, item.footer, item.task_name,
+            item.fields, item.before, item.after)
+
+    async def _flush_loop(self):
+        """Send queued embeds, up to Discord's per-message limits at a time."""
+        if self._channel is None and self._bot:
+            # Channels are not cached until the bot is ready.
+            await self._bot.wait_until_ready()
+            self._resolve_channel()
+        held = None
+        while True:
+            try:
+                held = await self._flush_batch(held)
+            except Exception:
+                # One bad entry must not stop the only worker draining the queue.
+                logger.exception("Failed to build audit log batch; skipping it")
+                held = None
+
+    async def _flush_batch(self, held: Optional[discord.Embed]) -> Optional[discord.Embed]:
+        """Build and send one message's worth of embeds, starting with *held*.
+
+        Returns the embed that did not fit, to start the next batch with.
+        """
+        queue = self._queue
+        if held is not None:
+            batch = [held]
+            held = None
+        else:
+            batch = []
+            try:
+                first = await asyncio.wait_for(queue.get(), self._drop_report_delay())
+            except asyncio.TimeoutError:
+                # Nothing new arrived, but there are drops left to report.
+                pass
             else:
-                logger.warning(
-                    f"LOG_CHANNEL {Settings.LOG_CHANNEL} not found or not cached.")
+                if isinstance(first, _PendingDiff):
+                    # Leave the edit open for follow-ups before rendering it.
+                    delay = first.due - time.monotonic()
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+                first = await self._render(first)
+                if first is not None:
+                    batch.append(first)
+        size = sum(len(embed) for embed in batch)
+        while len(batch) < _MAX_EMBEDS_PER_MESSAGE:
+            try:
+                embed = await self._render(queue.get_nowait())
+            except asyncio.QueueEmpty:
+                break
+            if embed is None:
+                continue
+            if size + len(embed) > _MAX_EMBED_CHARS_PER_MESSAGE:
+                held = embed
+                break
+            batch.append(embed)
+            size += len(embed)
+        self._append_drop_report(batch, size)
+        if not batch:
+            return held
+        # Embeds are stamped here, once per flush, rather than as each is built.
+        now = datetime.now(timezone.utc)
+        for embed in batch:
+            embed.timestamp = now
+        try:
+            await self._send_batch(batch)
         except Exception as exc:
             logger.warning(f"Failed to send audit log to channel: {exc}")
+        return held
 
-    def _make_embed(
-        self,
-        title: str,
-        color: discord.Color,
-        actor: Optional[Union[discord.User, discord.Member]] = None,
-    ) -> discord.Embed:
+    def _drop_report_delay(self) -> Optional[float]:
+        """Seconds until a pending drop notice is due, or None if none is pending."""
+        if not self._dropped:
+            return None
+        return max(0.0, self._next_drop_report - time.monotonic())
+
+    def _append_drop_report(self, batch: list, size: int):
+        """Add an "events dropped" notice to *batch* if one is due and fits."""
+        if not self._dropped or time.monotonic() < self._next_drop_report:
+            return
+        embed = self._make_embed(
+            f"⚠️ {self._dropped} audit events dropped due to backlog",
+            self._WARNING_COLOR,
+        )
+        if len(batch) >= _MAX_EMBEDS_PER_MESSAGE or size + len(embed) > _MAX_EMBED_CHARS_PER_MESSAGE:
+            return
+        logger.warning(f"Dropped {self._dropped} audit log events: queue full")
+        batch.append(embed)
+        self._dropped = 0
+        self._next_drop_report = time.monotonic() + _DROP_REPORT_INTERVAL
+
+    async def _send_batch(self, batch: list):
+        channel = self._channel or self._resolve_channel()
+        if not channel:
+            logger.warning(
+                f"LOG_CHANNEL {self._log_channel_id} not found or not cached.")
+            return
+        for attempt in range(_SEND_ATTEMPTS):
+            try:
+                await channel.send(embeds=batch)
+                return
+            except discord.HTTPException as exc:
+                if exc.status != 429 or attempt == _SEND_ATTEMPTS - 1:
+                    raise
+                retry_after = getattr(exc, "retry_after", None)
+                if retry_after is None:
+                    retry_after = float(exc.response.headers.get("Retry-After", 1))
+                logger.warning(
+                    f"Audit log channel rate limited; retrying in {retry_after + 1:.1f}s")
+                await asyncio.sleep(retry_after + 1)
+
+    def _make_embed(self, title: str, color: discord.Color, footer: Optional[dict] = None) -> discord.Embed:
         embed = discord.Embed(
             title=title,
             color=color,
-            timestamp=datetime.now(timezone.utc),
         )
-        if actor:
-            embed.set_footer(
-                text=f"{actor.display_name} (@{actor.name})",
-                icon_url=str(
-                    actor.display_avatar.url) if actor.display_avatar else None,
+        if footer:
+            embed.set_footer(**footer)
+        return embed
+
+    @staticmethod
+    def _actor_footer(actor: Union[discord.User, discord.Member]) -> dict:
+        footer = {"text": f"{actor.display_name} (@{actor.name})"}
+        if actor.display_avatar:
+            footer["icon_url"] = str(actor.display_avatar.url)
+        return footer
+
+    @staticmethod
+    def _source_footer(source: str) -> dict:
+        return {"text": f"via {source}"}
+
+    @staticmethod
+    def _make_embed_fast(title: str, color: discord.Color, footer: dict, fields: list) -> discord.Embed:
+        """Build a fixed-shape embed from a plain dict in one from_dict call.
+
+        *fields* is a list of ``{"name", "value", "inline"}`` dicts.
+        """
+        return discord.Embed.from_dict({
+            "title": title,
+            "color": color.value,
+            "footer": footer,
+            "fields": fields,
+        })
+
+    # ------------------------------------------------------------------
+    # Shared implementations. *by* is the "By" field value (a mention for
+    # Discord users, the source name for external events) and *footer* the
+    # embed footer dict; the public log_* methods below only supply those.
+    # ------------------------------------------------------------------
+
+    async def _log_task_created(self, by: str, footer: dict, task_name: str, task: dict):
+        if not self._log_enabled():
+            return
+        fields = [{"name": "By", "value": by, "inline": False}]
+        if task.get("owner"):
+            fields.append({"name": "Owner", "value": task["owner"], "inline": True})
+        if task.get("deadline"):
+            fields.append({"name": "Deadline", "value": task["deadline"], "inline": True})
+        if task.get("description"):
+            fields.append({
+                "name": "Description",
+                "value": task["description"][:_MAX_DESCRIPTION_PREVIEW],
+                "inline": False,
+            })
+        if task.get("url"):
+            fields.append({"name": "URL", "value": _trunc(task["url"]), "inline": False})
+        await self._send_log(self._make_embed_fast(
+            f"✅ Task Created: **{task_name}**",
+            self._CREATE_COLOR,
+            footer,
+            fields,
+        ))
+
+    async def _diff_embed(self, title: str, by: str, footer: dict, task_name: str,
+                          fields: tuple, before: dict, after: dict) -> Optional[discord.Embed]:
+        changes = _diff_changes(fields, before, after)
+        if not changes:
+            return None
+        embed = self._make_embed(title, self._UPDATE_COLOR, footer)
+        embed.add_field(name="By", value=by, inline=False)
+        for label, old_val, new_val in changes:
+            embed.add_field(
+                name=label,
+                value=await _format_diff_value(old_val, new_val, label, task_name),
+                inline=True,
             )
         return embed
 
+    async def _log_diff(self, title: str, by: str, footer: dict, task_name: str,
+                        fields: tuple, before: dict, after: dict):
+        # One dict comparison settles the common no-op case before any per-field work.
+        if before == after or not self._log_enabled():
+            return
+        embed = await self._diff_embed(title, by, footer, task_name, fields, before, after)
+        if embed is not None:
+            await self._send_log(embed)
+
+    async def _log_subtask_edited(self, by: str, footer: dict, task_name: str,
+                                  subtask_id: int, before: dict, after: dict):
+        """Queue a subtask edit diff, merging it into a still-queued edit of the same subtask."""
+        if before == after or not self._log_enabled():
+            return
+        key = (task_name, subtask_id, by)
+        pending = self._pending_edits.get(key)
+        if pending is not None:
+            pending.after = after
+            return
+        diff = _PendingDiff(
+            key, f"✏️ Sub-task #{subtask_id} Edited on **{task_name}**", by, footer,
+            task_name, _SUBTASK_DIFF_FIELDS, before, after,
+            time.monotonic() + _EDIT_COALESCE_WINDOW)
+        self._pending_edits[key] = diff
+        await self._send_log(diff)
+
+    async def _log_task_deleted(self, by: str, footer: dict, task_name: str):
+        if not self._log_enabled():
+            return
+        await self._send_log(self._make_embed_fast(
+            f"🗑️ Task Deleted: **{task_name}**",
+            self._DELETE_COLOR,
+            footer,
+            [{"name": "By", "value": by, "inline": False}],
+        ))
+
+    async def _log_subtask_added(self, by: str, footer: dict, task_name: str, subtask: dict):
+        if not self._log_enabled():
+            return
+        fields = [
+            {"name": "By", "value": by, "inline": False},
+            {"name": "Sub-task", "value": _trunc(subtask.get("name", "Unnamed")), "inline": True},
+        ]
+        if subtask.get("description"):
+            fields.append({
+                "name": "Description",
+                "value": subtask["description"][:_MAX_DESCRIPTION_PREVIEW],
+                "inline": False,
+            })
+        if subtask.get("url"):
+            fields.append({"name": "URL", "value": _trunc(subtask["url"]), "inline": False})
+        await self._send_log(self._make_embed_fast(
+            f"➕ Sub-task Added to **{task_name}**",
+            self._CREATE_COLOR,
+            footer,
+            fields,
+        ))
+
+    async def _log_subtask_toggled(self, by: str, footer: dict, task_name: str,
+                                   subtask_id: int, subtask_name: str, completed: bool):
+        if not self._log_enabled():
+            return
+        await self._send_log(self._make_embed_fast(
+            f"🔄 Sub-task #{subtask_id} Toggled on **{task_name}**",
+            self._TOGGLE_COLOR,
+            footer,
+            [
+                {"name": "By", "value": by, "inline": False},
+                {"name": "Sub-task", "value": _trunc(subtask_name), "inline": True},
+                {"name": "New Status", "value": "✅ Complete" if completed else "☐ Incomplete", "inline": True},
+            ],
+        ))
+
+    async def _log_subtask_deleted(self, by: str, footer: dict, task_name: str,
+                                   subtask_id: int, subtask_name: str):
+        if not self._log_enabled():
+            return
+        await self._send_log(self._make_embed_fast(
+            f"🗑️ Sub-task #{subtask_id} Deleted from **{task_name}**",
+            self._DELETE_COLOR,
+            footer,
+            [
+                {"name": "By", "value": by, "inline": False},
+                {"name": "Sub-task", "value": _trunc(subtask_name), "inline": False},
+            ],
+        ))
+
+    # ------------------------------------------------------------------
+    # Actions performed through the bot
+    # ------------------------------------------------------------------
+
     async def log_task_created(
         self,
         actor: Union[discord.User, discord.Member],
@@ -105,27 +473,7 @@ class LoggingService:
         task: dict,
     ):
         """Log a new task being created."""
-        embed = self._make_embed(
-            f"✅ Task Created: **{task_name}**",
-            _LOG_COLORS["create"],
-            actor,
-        )
-        embed.add_field(name="By", value=actor.mention, inline=False)
-        if task.get("owner"):
-            embed.add_field(name="Owner", value=task["owner"], inline=True)
-        if task.get("deadline"):
-            embed.add_field(name="Deadline",
-                            value=task["deadline"], inline=True)
-        if task.get("description"):
-            embed.add_field(
-                name="Description",
-                value=task["description"][:_MAX_DESCRIPTION_PREVIEW],
-                inline=False,
-            )
-        if task.get("url"):
-            embed.add_field(name="URL", value=_trunc(
-                task["url"]), inline=False)
-        await self._send_log(embed)
+        await self._log_task_created(actor.mention, self._actor_footer(actor), task_name, task)
 
     async def log_task_configured(
         self,
@@ -140,35 +488,10 @@ class LoggingService:
         status, priority, owner, deadline, description, url.
         Only changed fields are shown.
         """
-        field_labels = {
-            "status": "Status",
-            "priority": "Priority",
-            "owner": "Owner",
-            "deadline": "Deadline",
-            "description": "Description",
-            "url": "URL",
-        }
-        changes = [
-            (label, before.get(key) or "*empty*", after.get(key) or "*empty*")
-            for key, label in field_labels.items()
-            if before.get(key) != after.get(key)
-        ]
-        if not changes:
-            return
-
-        embed = self._make_embed(
+        await self._log_diff(
             f"⚙️ Task Configured: **{task_name}**",
-            _LOG_COLORS["update"],
-            actor,
-        )
-        embed.add_field(name="By", value=actor.mention, inline=False)
-        for label, old_val, new_val in changes:
-            embed.add_field(
-                name=label,
-                value=_format_diff_value(old_val, new_val, label, task_name),
-                inline=True,
-            )
-        await self._send_log(embed)
+            actor.mention, self._actor_footer(actor),
+            task_name, _TASK_DIFF_FIELDS, before, after)
 
     async def log_task_renamed(
         self,
@@ -177,33 +500,79 @@ class LoggingService:
         actor: Optional[Union[discord.User, discord.Member]] = None,
     ):
         """Log a task rename (e.g. from a thread title edit)."""
+        if not self._log_enabled():
+            return
         embed = self._make_embed(
-            "✏️ Task Renamed", _LOG_COLORS["rename"], actor)
+            "✏️ Task Renamed", self._RENAME_COLOR,
+            self._actor_footer(actor) if actor else None)
         embed.add_field(name="Before", value=_trunc(old_name), inline=True)
         embed.add_field(name="After", value=_trunc(new_name), inline=True)
         if actor:
             embed.add_field(name="By", value=actor.mention, inline=False)
         await self._send_log(embed)
 
+    async def log_task_deleted(
+        self,
+        actor: Union[discord.User, discord.Member],
+        task_name: str,
+    ):
+        """Log a task deletion."""
+        await self._log_task_deleted(actor.mention, self._actor_footer(actor), task_name)
+
+    async def log_subtask_added(
+        self,
+        actor: Union[discord.User, discord.Member],
+        task_name: str,
+        subtask: dict,
+    ):
+        """Log a new subtask being added to a task."""
+        await self._log_subtask_added(actor.mention, self._actor_footer(actor), task_name, subtask)
+
+    async def log_subtask_edited(
+        self,
+        actor: Union[discord.User, discord.Member],
+        task_name: str,
+        subtask_id: int,
+        before: dict,
+        after: dict,
+    ):
+        """Log subtask field edits with a before/after diff.
+
+        *before* and *after* are dicts with keys: name, description, url.
+        """
+        await self._log_subtask_edited(
+            actor.mention, self._actor_footer(actor),
+            task_name, subtask_id, before, after)
+
+    async def log_subtask_toggled(
+        self,
+        actor: Union[discord.User, discord.Member],
+        task_name: str,
+        subtask_id: int,
+        subtask_name: str,
+        completed: bool,
+    ):
+        """Log a subtask completion toggle."""
+        await self._log_subtask_toggled(
+            actor.mention, self._actor_footer(actor),
+            task_name, subtask_id, subtask_name, completed)
+
+    async def log_subtask_deleted(
+        self,
+        actor: Union[discord.User, discord.Member],
+        task_name: str,
+        subtask_id: int,
+        subtask_name: str,
+    ):
+        """Log a subtask deletion."""
+        await self._log_subtask_deleted(
+            actor.mention, self._actor_footer(actor),
+            task_name, subtask_id, subtask_name)
+
     # ------------------------------------------------------------------
     # External-source logging (events from Web App / Desktop App / etc.)
     # ------------------------------------------------------------------
 
-    def _make_external_embed(
-        self,
-        title: str,
-        color: discord.Color,
-        source: str,
-    ) -> discord.Embed:
-        """Create an embed for an externally-triggered event."""
-        embed = discord.Embed(
-            title=title,
-            color=color,
-            timestamp=datetime.now(timezone.utc),
-        )
-        embed.set_footer(text=f"via {source}")
-        return embed
-
     async def log_task_created_externally(
         self,
         source: str,
@@ -211,28 +580,7 @@ class LoggingService:
         task_after: dict,
     ):
         """Log a task created outside Discord."""
-        embed = self._make_external_embed(
-            f"✅ Task Created: **{task_name}**",
-            _LOG_COLORS["create"],
-            source,
-        )
-        embed.add_field(name="By", value=source, inline=False)
-        if task_after.get("owner"):
-            embed.add_field(
-                name="Owner", value=task_after["owner"], inline=True)
-        if task_after.get("deadline"):
-            embed.add_field(name="Deadline",
-                            value=task_after["deadline"], inline=True)
-        if task_after.get("description"):
-            embed.add_field(
-                name="Description",
-                value=task_after["description"][:_MAX_DESCRIPTION_PREVIEW],
-                inline=False,
-            )
-        if task_after.get("url"):
-            embed.add_field(name="URL", value=_trunc(
-                task_after["url"]), inline=False)
-        await self._send_log(embed)
+        await self._log_task_created(source, self._source_footer(source), task_name, task_after)
 
     async def log_task_updated_externally(
         self,
@@ -242,36 +590,10 @@ class LoggingService:
         after: dict,
     ):
         """Log task field changes from an external source with before/after diff."""
-        field_labels = {
-            "status": "Status",
-            "priority": "Priority",
-            "owner": "Owner",
-            "deadline": "Deadline",
-            "description": "Description",
-            "url": "URL",
-            "name": "Name",
-        }
-        changes = [
-            (label, before.get(key) or "*empty*", after.get(key) or "*empty*")
-            for key, label in field_labels.items()
-            if before.get(key) != after.get(key)
-        ]
-        if not changes:
-            return
-
-        embed = self._make_external_embed(
+        await self._log_diff(
             f"⚙️ Task Configured: **{task_name}**",
-            _LOG_COLORS["update"],
-            source,
-        )
-        embed.add_field(name="By", value=source, inline=False)
-        for label, old_val, new_val in changes:
-            embed.add_field(
-                name=label,
-                value=_format_diff_value(old_val, new_val, label, task_name),
-                inline=True,
-            )
-        await self._send_log(embed)
+            source, self._source_footer(source),
+            task_name, _TASK_DIFF_FIELDS_EXT, before, after)
 
     async def log_task_deleted_externally(
         self,
@@ -279,13 +601,7 @@ class LoggingService:
         task_name: str,
     ):
         """Log a task deletion from an external source."""
-        embed = self._make_external_embed(
-            f"🗑️ Task Deleted: **{task_name}**",
-            _LOG_COLORS["delete"],
-            source,
-        )
-        embed.add_field(name="By", value=source, inline=False)
-        await self._send_log(embed)
+        await self._log_task_deleted(source, self._source_footer(source), task_name)
 
     async def log_subtask_added_externally(
         self,
@@ -294,24 +610,7 @@ class LoggingService:
         subtask: dict,
     ):
         """Log a subtask added from an external source."""
-        embed = self._make_external_embed(
-            f"➕ Sub-task Added to **{task_name}**",
-            _LOG_COLORS["create"],
-            source,
-        )
-        embed.add_field(name="By", value=source, inline=False)
-        embed.add_field(
-            name="Sub-task", value=_trunc(subtask.get("name", "Unnamed")), inline=True)
-        if subtask.get("description"):
-            embed.add_field(
-                name="Description",
-                value=subtask["description"][:_MAX_DESCRIPTION_PREVIEW],
-                inline=False,
-            )
-        if subtask.get("url"):
-            embed.add_field(name="URL", value=_trunc(
-                subtask["url"]), inline=False)
-        await self._send_log(embed)
+        await self._log_subtask_added(source, self._source_footer(source), task_name, subtask)
 
     async def log_subtask_edited_externally(
         self,
@@ -322,32 +621,9 @@ class LoggingService:
         after: dict,
     ):
         """Log subtask field edits from an external source with before/after diff."""
-        field_labels = {
-            "name": "Name",
-            "description": "Description",
-            "url": "URL",
-        }
-        changes = [
-            (label, before.get(key) or "*empty*", after.get(key) or "*empty*")
-            for key, label in field_labels.items()
-            if before.get(key) != after.get(key)
-        ]
-        if not changes:
-            return
-
-        embed = self._make_external_embed(
-            f"✏️ Sub-task #{subtask_id} Edited on **{task_name}**",
-            _LOG_COLORS["update"],
-            source,
-        )
-        embed.add_field(name="By", value=source, inline=False)
-        for label, old_val, new_val in changes:
-            embed.add_field(
-                name=label,
-                value=_format_diff_value(old_val, new_val, label, task_name),
-                inline=True,
-            )
-        await self._send_log(embed)
+        await self._log_subtask_edited(
+            source, self._source_footer(source),
+            task_name, subtask_id, before, after)
 
     async def log_subtask_toggled_externally(
         self,
@@ -358,17 +634,9 @@ class LoggingService:
         completed: bool,
     ):
         """Log a subtask completion toggle from an external source."""
-        status = "✅ Complete" if completed else "☐ Incomplete"
-        embed = self._make_external_embed(
-            f"🔄 Sub-task #{subtask_id} Toggled on **{task_name}**",
-            _LOG_COLORS["toggle"],
-            source,
-        )
-        embed.add_field(name="By", value=source, inline=False)
-        embed.add_field(name="Sub-task",
-                        value=_trunc(subtask_name), inline=True)
-        embed.add_field(name="New Status", value=status, inline=True)
-        await self._send_log(embed)
+        await self._log_subtask_toggled(
+            source, self._source_footer(source),
+            task_name, subtask_id, subtask_name, completed)
 
     async def log_subtask_deleted_externally(
         self,
@@ -378,145 +646,20 @@ class LoggingService:
         subtask_name: str,
     ):
         """Log a subtask deletion from an external source."""
-        embed = self._make_external_embed(
-            f"🗑️ Sub-task #{subtask_id} Deleted from **{task_name}**",
-            _LOG_COLORS["delete"],
-            source,
-        )
-        embed.add_field(name="By", value=source, inline=False)
-        embed.add_field(name="Sub-task",
-                        value=_trunc(subtask_name), inline=False)
-        await self._send_log(embed)
-
-    async def log_subtask_added(
-        self,
-        actor: Union[discord.User, discord.Member],
-        task_name: str,
-        subtask: dict,
-    ):
-        """Log a new subtask being added to a task."""
-        embed = self._make_embed(
-            f"➕ Sub-task Added to **{task_name}**",
-            _LOG_COLORS["create"],
-            actor,
-        )
-        embed.add_field(name="By", value=actor.mention, inline=False)
-        embed.add_field(
-            name="Sub-task", value=_trunc(subtask.get("name", "Unnamed")), inline=True)
-        if subtask.get("description"):
-            embed.add_field(
-                name="Description",
-                value=subtask["description"][:_MAX_DESCRIPTION_PREVIEW],
-                inline=False,
-            )
-        if subtask.get("url"):
-            embed.add_field(name="URL", value=_trunc(
-                subtask["url"]), inline=False)
-        await self._send_log(embed)
-
-    async def log_subtask_edited(
-        self,
-        actor: Union[discord.User, discord.Member],
-        task_name: str,
-        subtask_id: int,
-        before: dict,
-        after: dict,
-    ):
-        """Log subtask field edits with a before/after diff.
-
-        *before* and *after* are dicts with keys: name, description, url.
-        """
-        field_labels = {
-            "name": "Name",
-            "description": "Description",
-            "url": "URL",
-        }
-        changes = [
-            (label, before.get(key) or "*empty*", after.get(key) or "*empty*")
-            for key, label in field_labels.items()
-            if before.get(key) != after.get(key)
-        ]
-        if not changes:
-            return
-
-        embed = self._make_embed(
-            f"✏️ Sub-task #{subtask_id} Edited on **{task_name}**",
-            _LOG_COLORS["update"],
-            actor,
-        )
-        embed.add_field(name="By", value=actor.mention, inline=False)
-        for label, old_val, new_val in changes:
-            embed.add_field(
-                name=label,
-                value=_format_diff_value(old_val, new_val, label, task_name),
-                inline=True,
-            )
-        await self._send_log(embed)
-
-    async def log_subtask_toggled(
-        self,
-        actor: Union[discord.User, discord.Member],
-        task_name: str,
-        subtask_id: int,
-        subtask_name: str,
-        completed: bool,
-    ):
-        """Log a subtask completion toggle."""
-        status = "✅ Complete" if completed else "☐ Incomplete"
-        embed = self._make_embed(
-            f"🔄 Sub-task #{subtask_id} Toggled on **{task_name}**",
-            _LOG_COLORS["toggle"],
-            actor,
-        )
-        embed.add_field(name="By", value=actor.mention, inline=False)
-        embed.add_field(name="Sub-task",
-                        value=_trunc(subtask_name), inline=True)
-        embed.add_field(name="New Status", value=status, inline=True)
-        await self._send_log(embed)
-
-    async def log_task_deleted(
-        self,
-        actor: Union[discord.User, discord.Member],
-        task_name: str,
-    ):
-        """Log a task deletion."""
-        embed = self._make_embed(
-            f"🗑️ Task Deleted: **{task_name}**",
-            _LOG_COLORS["delete"],
-            actor,
-        )
-        embed.add_field(name="By", value=actor.mention, inline=False)
-        await self._send_log(embed)
-
-    async def log_subtask_deleted(
-        self,
-        actor: Union[discord.User, discord.Member],
-        task_name: str,
-        subtask_id: int,
-        subtask_name: str,
-    ):
-        """Log a subtask deletion."""
-        embed = self._make_embed(
-            f"🗑️ Sub-task #{subtask_id} Deleted from **{task_name}**",
-            _LOG_COLORS["delete"],
-            actor,
-        )
-        embed.add_field(name="By", value=actor.mention, inline=False)
-        embed.add_field(name="Sub-task",
-                        value=_trunc(subtask_name), inline=False)
-        await self._send_log(embed)
+        await self._log_subtask_deleted(
+            source, self._source_footer(source),
+            task_name, subtask_id, subtask_name)
 
 
 # ---------------------------------------------------------------------------
 # Module-level singleton – initialised once and shared across all importers.
 # ---------------------------------------------------------------------------
 
-_logging_service: Optional[LoggingService] = None
+# Created at import: the import system runs this exactly once, even with
+# several threads importing, and construction touches no loop or channel.
+_logging_service = LoggingService()
 
 
 def get_logging_service() -> LoggingService:
-    """Return (creating if necessary) the module-level LoggingService singleton."""
-    global _logging_service
-    if _logging_service is None:
-        _logging_service = LoggingService()
+    """Return the module-level LoggingService singleton."""
     return _logging_service
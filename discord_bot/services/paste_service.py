@@ -5,43 +5,199 @@ Used by both the logging service (diff uploads) and modals (long description
 storage). Descriptions exceeding DESCRIPTION_PASTE_THRESHOLD chars are uploaded
 to koda-paste; the returned URL is stored in the database instead of the raw text.
 """
+import hashlib
 import json
 import logging
 import os
 import socket
 import time
 import asyncio
-from typing import Optional
-from urllib.parse import urlparse
-from urllib.request import Request, urlopen
-from urllib.error import URLError
+from collections import OrderedDict
+from json.encoder import encode_basestring_ascii
+from typing import AsyncIterator, Iterator, Optional
+from urllib.parse import urlparse, ParseResult
+
+import aiohttp
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 logger = logging.getLogger(__name__)
 
-# Descriptions longer than this are offloaded to koda-paste.
+# Descriptions longer than this are offloaded to koda-paste. Measured in
+# characters (len() of the str), not UTF-8 bytes: Discord's modal and embed
+# limits count characters, and the web app applies the same len() check.
 DESCRIPTION_PASTE_THRESHOLD = 500
 
 _PASTE_URL = os.environ.get("KODA_PASTE_URL", "").rstrip("/")
+# Prefixes of stored paste links (empty when no paste URL is configured); a
+# description is a paste link iff it startswith() one of these.
+PASTE_URL_PREFIXES: tuple[str, ...] = (f"{_PASTE_URL}/p/",) if _PASTE_URL else ()
 _PASTE_RETRY_AFTER = 0.0
 _PASTE_DNS_BACKOFF_SECONDS = 300
 _PASTE_FAILURE_BACKOFF_SECONDS = 120
+_PASTE_TIMEOUT_SECONDS = 5
+# Content longer than this is sent as a chunked, incrementally escaped JSON
+# body so peak memory tracks the chunk size rather than the paste size.
+_PASTE_STREAM_THRESHOLD = 64 * 1024
+_PASTE_STREAM_CHUNK = 8 * 1024
+
+# hostname -> (monotonic time looked up, resolvable); entries live _DNS_TTL seconds.
+_DNS_CACHE: dict[str, tuple[float, bool]] = {}
+_DNS_TTL = 60.0
+
+# Recently uploaded pastes, keyed by (content digest, title), so re-logging an
+# identical diff reuses its URL. Failed uploads are never cached.
+_PASTE_CACHE_SIZE = 256
+_paste_cache: "OrderedDict[tuple[bytes, str], str]" = OrderedDict()
+
+# Shared aiohttp session for async uploads, created lazily inside the running
+# loop so TCP/TLS connections to koda-paste are reused between uploads.
+_session: Optional[aiohttp.ClientSession] = None
+
+
+class PasteUnavailable(Exception):
+    """No upload was attempted: koda-paste is unconfigured, backing off after a
+    failure, or its host does not resolve."""
+
+
+def _dns_cached(hostname: str) -> Optional[bool]:
+    entry = _DNS_CACHE.get(hostname)
+    if entry and time.monotonic() - entry[0] < _DNS_TTL:
+        return entry[1]
+    return None
 
 
 def _paste_host_resolvable(hostname: str) -> bool:
     if not hostname:
         return False
+    cached = _dns_cached(hostname)
+    if cached is not None:
+        return cached
     try:
-        socket.getaddrinfo(hostname, None)
-        return True
+        # SOCK_STREAM only: we just need to know a TCP address exists.
+        socket.getaddrinfo(hostname, None, type=socket.SOCK_STREAM)
+        resolvable = True
     except socket.gaierror:
+        resolvable = False
+    _DNS_CACHE[hostname] = (time.monotonic(), resolvable)
+    return resolvable
+
+
+async def _async_paste_host_resolvable(hostname: str) -> bool:
+    if not hostname:
         return False
+    cached = _dns_cached(hostname)
+    if cached is not None:
+        return cached
+    # getaddrinfo blocks; keep cold lookups off the event loop.
+    return await asyncio.to_thread(_paste_host_resolvable, hostname)
+
+
+def new_paste_session(limit: int = 10) -> aiohttp.ClientSession:
+    """Create a keep-alive aiohttp session for paste uploads.
+
+    Must be called inside a running event loop; the caller owns (and closes)
+    the session. *limit* caps the pooled connections to koda-paste.
+    """
+    return aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(limit=limit, keepalive_timeout=60),
+        timeout=aiohttp.ClientTimeout(total=_PASTE_TIMEOUT_SECONDS),
+    )
+
+
+def _get_session() -> aiohttp.ClientSession:
+    global _session
+    if _session is None or _session.closed:
+        _session = new_paste_session()
+    return _session
+
 
+async def close_paste_session():
+    """Close the shared async upload session, e.g. before the event loop ends."""
+    global _session
+    if _session is not None and not _session.closed:
+        await _session.close()
+    _session = None
 
-def upload_to_paste(content: str, title: str = "Paste") -> Optional[str]:
-    """Upload content to koda-paste and return the share URL, or None on failure."""
+
+def _paste_payload(content: str, title: str) -> bytes:
+    """JSON request body for the paste API (orjson when available)."""
+    body = {"content": content, "title": title}
+    if orjson is not None:
+        try:
+            return orjson.dumps(body)
+        except TypeError:
+            # orjson rejects lone surrogates, which Discord input can contain.
+            pass
+    return json.dumps(body).encode()
+
+
+def _json_string(value: str) -> bytes:
+    """*value* as a quoted JSON string (orjson when available)."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(value)
+        except TypeError:
+            # Lone surrogates, as in _paste_payload.
+            pass
+    return encode_basestring_ascii(value).encode()
+
+
+def _paste_payload_chunks(content: str, title: str) -> Iterator[bytes]:
+    """Same JSON body as _paste_payload, produced piecewise.
+
+    *content* is escaped _PASTE_STREAM_CHUNK characters at a time, so no full
+    escaped or encoded copy of it is ever held.
+    """
+    yield b'{"title":' + _json_string(title) + b',"content":"'
+    for start in range(0, len(content), _PASTE_STREAM_CHUNK):
+        # Slices of a str are whole code points, so each escapes on its own;
+        # drop the quotes around it.
+        yield _json_string(content[start:start + _PASTE_STREAM_CHUNK])[1:-1]
+    yield b'"}'
+
+
+async def _async_paste_body(content: str, title: str) -> AsyncIterator[bytes]:
+    # aiohttp streams async iterables with chunked transfer encoding.
+    for chunk in _paste_payload_chunks(content, title):
+        yield chunk
+
+
+def _paste_cache_key(content: str, title: str) -> tuple[bytes, str]:
+    # Hashed _PASTE_STREAM_CHUNK characters at a time, like the streamed body,
+    # so no encoded copy of the whole content is held.
+    digest = hashlib.blake2b(digest_size=16)
+    for start in range(0, len(content), _PASTE_STREAM_CHUNK):
+        digest.update(content[start:start + _PASTE_STREAM_CHUNK].encode("utf-8", "surrogatepass"))
+    return digest.digest(), title
+
+
+def _cached_paste_url(key: tuple[bytes, str]) -> Optional[str]:
+    url = _paste_cache.get(key)
+    if url is not None:
+        _paste_cache.move_to_end(key)
+    return url
+
+
+def _remember_paste_url(key: tuple[bytes, str], url: Optional[str]):
+    if not url:
+        return
+    _paste_cache[key] = url
+    if len(_paste_cache) > _PASTE_CACHE_SIZE:
+        _paste_cache.popitem(last=False)
+
+
+def _paste_target(now: float) -> Optional[ParseResult]:
+    """Return the parsed KODA_PASTE_URL if an upload may be attempted now.
+
+    Returns None (arming the backoff where appropriate) while backing off or
+    when the URL is missing/invalid.
+    """
     global _PASTE_RETRY_AFTER
 
-    now = time.time()
     if now < _PASTE_RETRY_AFTER:
         return None
     if not _PASTE_URL:
@@ -54,52 +210,36 @@ def upload_to_paste(content: str, title: str = "Paste") -> Optional[str]:
         logger.warning(f"Invalid KODA_PASTE_URL configured: {_PASTE_URL}")
         _PASTE_RETRY_AFTER = now + _PASTE_FAILURE_BACKOFF_SECONDS
         return None
+    return parsed_url
 
-    # Only use the configured KODA_PASTE_URL (no fallback). If the host is
-    # not resolvable we fail early and set backoff; the operator should set
-    # KODA_PASTE_URL to an IP if they prefer to avoid DNS.
-    if not _paste_host_resolvable(parsed_url.hostname or ""):
-        logger.warning(
-            f"koda-paste DNS lookup failed for '{parsed_url.hostname}' — "
-            "ensure KODA_PASTE_URL is reachable from this host (use an IP if needed)"
-        )
-        _PASTE_RETRY_AFTER = now + _PASTE_DNS_BACKOFF_SECONDS
-        return None
 
-    try:
-        payload = json.dumps({"content": content, "title": title}).encode()
-        req = Request(
-            f"{_PASTE_URL}/api/paste",
-            data=payload,
-            headers={"Content-Type": "application/json"},
-            method="POST",
-        )
-        with urlopen(req, timeout=5) as resp:
-            result = json.loads(resp.read().decode())
-            return result.get("url")
-    except (URLError, OSError, json.JSONDecodeError, KeyError) as e:
-        logger.warning(f"Failed to upload to koda-paste: {e}")
-        _PASTE_RETRY_AFTER = now + _PASTE_FAILURE_BACKOFF_SECONDS
-        return None
+def _dns_failed(hostname: str, now: float):
+    global _PASTE_RETRY_AFTER
+    logger.warning(
+        f"koda-paste DNS lookup failed for '{hostname}' — "
+        "ensure KODA_PASTE_URL is reachable from this host (use an IP if needed)"
+    )
+    _PASTE_RETRY_AFTER = now + _PASTE_DNS_BACKOFF_SECONDS
+
+
+def _upload_failed(error: Exception, now: float):
+    global _PASTE_RETRY_AFTER
+    logger.warning(f"Failed to upload to koda-paste: {error}")
+    _PASTE_RETRY_AFTER = now + _PASTE_FAILURE_BACKOFF_SECONDS
+
+
+def _unavailable(reason: str, raise_unavailable: bool) -> None:
+    if raise_unavailable:
+        raise PasteUnavailable(reason)
+    return None
 
 
 def is_paste_url(value: str) -> bool:
     """Return True if the value looks like a koda-paste URL (stored description)."""
-    paste_base = _PASTE_URL.rstrip("/")
-    return value.startswith(paste_base + "/p/")
+    return value.startswith(PASTE_URL_PREFIXES)
 
 
-def offload_description(description: str, title: str = "Description") -> str:
-    """
-    If description exceeds DESCRIPTION_PASTE_THRESHOLD, upload to koda-paste
-    and return the paste URL. Otherwise return the description unchanged.
-    On paste failure, returns the original description (caller must handle
-    the 1000-char modal limit separately if needed).
-    """
-    if len(description) <= DESCRIPTION_PASTE_THRESHOLD:
-        return description
-
-    paste_url = upload_to_paste(description, title=title)
+def _offloaded(description: str, paste_url: Optional[str]) -> str:
     if paste_url:
         logger.info(f"Description offloaded to koda-paste: {paste_url}")
         return paste_url
@@ -109,11 +249,60 @@ def offload_description(description: str, title: str = "Description") -> str:
     return description
 
 
-async def async_upload_to_paste(content: str, title: str = "Paste") -> Optional[str]:
-    """Async wrapper for upload_to_paste to avoid blocking the event loop."""
-    return await asyncio.to_thread(upload_to_paste, content, title)
+async def async_upload_to_paste(content: str, title: str = "Paste",
+                                session: Optional[aiohttp.ClientSession] = None,
+                                raise_unavailable: bool = False) -> Optional[str]:
+    """Upload content to koda-paste and return the share URL, or None on failure.
+
+    Uses *session* if given (see new_paste_session), else the shared one. With
+    *raise_unavailable*, PasteUnavailable is raised instead of returning None
+    when no upload was attempted, so callers can tell it from a failed one.
+    """
+    key = _paste_cache_key(content, title)
+    cached = _cached_paste_url(key)
+    if cached:
+        return cached
+
+    now = time.time()
+    parsed_url = _paste_target(now)
+    if parsed_url is None:
+        return _unavailable("koda-paste is backing off or not configured", raise_unavailable)
 
+    if not await _async_paste_host_resolvable(parsed_url.hostname or ""):
+        _dns_failed(parsed_url.hostname or "", now)
+        return _unavailable(f"koda-paste host '{parsed_url.hostname}' does not resolve", raise_unavailable)
 
-async def async_offload_description(description: str, title: str = "Description") -> str:
-    """Async wrapper for offload_description to avoid blocking the event loop."""
-    return await asyncio.to_thread(offload_description, description, title)
+    try:
+        async with (session or _get_session()).post(
+            f"{_PASTE_URL}/api/paste",
+            data=(_async_paste_body(content, title)
+                  if len(content) > _PASTE_STREAM_THRESHOLD
+                  else _paste_payload(content, title)),
+            headers={"Content-Type": "application/json"},
+            raise_for_status=True,
+        ) as resp:
+            result = await resp.json(content_type=None,
+                                     loads=orjson.loads if orjson is not None else json.loads)
+        url = result.get("url")
+        _remember_paste_url(key, url)
+        return url
+    except (aiohttp.ClientError, asyncio.TimeoutError, OSError, json.JSONDecodeError, KeyError) as e:
+        _upload_failed(e, now)
+        return None
+
+
+async def async_offload_description(description: str, title: str = "Description",
+                                    session: Optional[aiohttp.ClientSession] = None,
+                                    raise_unavailable: bool = False) -> str:
+    """
+    If description exceeds DESCRIPTION_PASTE_THRESHOLD, upload to koda-paste
+    and return the paste URL. Otherwise return the description unchanged.
+    On paste failure, returns the original description (caller must handle
+    the 1000-char modal limit separately if needed). *raise_unavailable* is
+    passed to async_upload_to_paste.
+    """
+    if len(description) <= DESCRIPTION_PASTE_THRESHOLD:
+        return description
+    paste_url = await async_upload_to_paste(description, title=title, session=session,
+                                            raise_unavailable=raise_unavailable)
+    return _offloaded(description, paste_url)
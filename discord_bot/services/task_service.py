@@ -3,9 +3,9 @@ Task service layer for business logic
 """
 import logging
 import asyncio
-from typing import List, Optional
+from typing import AsyncIterator, Callable, Dict, List, Optional, Tuple
 from database.firebase_manager import DatabaseManager
-from database.task_model import Task, normalize_subtasks
+from database.task_model import Subtask, Task, normalize_subtasks
 
 logger = logging.getLogger(__name__)
 
@@ -29,6 +29,58 @@ class TaskService:
             tasks = [t for t in tasks if t.owner == owner]
         return tasks
 
+    async def iter_all_tasks(self, batch_size: int = 500,
+                             raw_filter: Optional[Callable[[dict], bool]] = None,
+                             start_after: Optional[str] = None) -> AsyncIterator[Task]:
+        """Yield all tasks in key order, fetching them a page at a time
+        (see DatabaseManager.iter_tasks)."""
+        pages = self.db.iter_tasks(self.username, batch_size, raw_filter, start_after)
+        while True:
+            page = await asyncio.to_thread(next, pages, None)
+            if page is None:
+                return
+            for task in page:
+                yield task
+
+    async def iter_long_description_tasks(
+            self, threshold: int, batch_size: int = 500,
+            start_after: Optional[str] = None) -> AsyncIterator[Tuple[Task, bool, List[Subtask]]]:
+        """Yield (task, task description is long, long subtasks) for tasks with
+        an inline (non-paste) task or subtask description over *threshold* chars.
+
+        Tasks with nothing to offload are filtered out page by page.
+        """
+        from services.paste_service import PASTE_URL_PREFIXES
+
+        def is_long(desc: str) -> bool:
+            # Length first: it rejects most descriptions without reading them.
+            # len() is O(1) on str and counts characters, like the threshold.
+            return len(desc) > threshold and not desc.startswith(PASTE_URL_PREFIXES)
+
+        def maybe_long(task_data: dict) -> bool:
+            # Runs on the stored dict, before Task.from_dict normalizes (and
+            # copies) every subtask. Stripping only shortens text, so a raw
+            # length at or under the threshold can never be long afterwards.
+            # Kept as short-circuiting per-dict checks: the records arrive as
+            # nested dicts a page at a time, so there is no column to vectorize,
+            # and most tasks are rejected by the first len() call.
+            if len(task_data.get('description') or "") > threshold:
+                return True
+            subtasks = task_data.get('subtasks') or ()
+            if isinstance(subtasks, dict):
+                subtasks = subtasks.values()
+            elif not isinstance(subtasks, list):
+                return False
+            return any(isinstance(st, dict) and len(st.get('description') or "") > threshold
+                       for st in subtasks)
+
+        async for task in self.iter_all_tasks(batch_size, maybe_long, start_after):
+            long_task = is_long(task.description or "")
+            # Task.from_dict normalized the subtasks, so every key is present.
+            long_subtasks = [Subtask.from_dict(st) for st in task.subtasks if is_long(st['description'])]
+            if long_task or long_subtasks:
+                yield task, long_task, long_subtasks
+
     async def get_task_by_name(self, task_name: str, owner: str = None) -> Optional[Task]:
         """Get a specific task by name (optionally filtered by owner)"""
         tasks = self.db.load_tasks(self.username)
@@ -132,6 +184,39 @@ class TaskService:
                             'description': description or ""})
         logger.info(f"Updated task description for UUID {task_uuid}")
 
+    async def update_descriptions_by_uuid(self, task_descriptions: Dict[str, str],
+                                          subtask_descriptions: Dict[Tuple[str, int], str]) -> int:
+        """Set many task and subtask descriptions with a single load and save.
+
+        *task_descriptions* maps task UUID to description; *subtask_descriptions*
+        maps (task UUID, subtask ID) to description. Unknown UUIDs and subtask IDs
+        are skipped. Returns the number of descriptions written.
+        """
+        if not task_descriptions and not subtask_descriptions:
+            return 0
+        tasks = self.db.load_tasks(self.username)
+        by_uuid = {t.uuid: t for t in tasks}
+        updated = 0
+        for task_uuid, description in task_descriptions.items():
+            task = by_uuid.get(task_uuid)
+            if task is not None:
+                task.description = description or ""
+                updated += 1
+        for (task_uuid, subtask_id), description in subtask_descriptions.items():
+            task = by_uuid.get(task_uuid)
+            if task is None:
+                continue
+            task.subtasks = normalize_subtasks(task.subtasks)
+            target = next(
+                (st for st in task.subtasks if st.get('id') == subtask_id), None)
+            if target is not None:
+                target['description'] = description.strip()
+                updated += 1
+        if updated:
+            self.db.save_tasks(self.username, tasks)
+        logger.info(f"Updated {updated} descriptions in one save")
+        return updated
+
     async def update_task_by_uuid(self, task_uuid: str, status: str, priority: str,
                                   owner: str, deadline: Optional[str],
                                   description: str, url: str):
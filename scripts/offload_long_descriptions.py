@@ -17,75 +17,332 @@ To apply changes:
 """
 import argparse
 import asyncio
+import hashlib
 import logging
+import logging.handlers
+import os
+import queue
+import sqlite3
+import time
+from collections import deque
+from pathlib import Path
+from typing import NamedTuple, Optional
+
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
 from services.task_service import TaskService
-from services.paste_service import offload_description, is_paste_url, DESCRIPTION_PASTE_THRESHOLD
+from services.paste_service import (
+    PasteUnavailable, async_offload_description, new_paste_session, DESCRIPTION_PASTE_THRESHOLD,
+)
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("offload_migration")
 
-async def main(dry_run: bool = True):
+
+def _setup_logging() -> logging.handlers.QueueListener:
+    """Log through a queue: callers only enqueue records, and formatting and
+    writing to stderr happen on the listener's thread."""
+    records = queue.SimpleQueue()
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter(logging.BASIC_FORMAT))
+    root = logging.getLogger()
+    root.addHandler(logging.handlers.QueueHandler(records))
+    root.setLevel(logging.INFO)
+    listener = logging.handlers.QueueListener(records, handler)
+    listener.start()
+    return listener
+
+
+# Uploader workers, i.e. paste uploads in flight at once.
+MAX_CONCURRENT_OFFLOADS = 16
+# Bound on jobs waiting for an uploader and on uploads waiting to be saved.
+_QUEUE_SIZE = 1000
+# Offloaded descriptions saved per TaskService load/save.
+WRITE_BATCH_SIZE = 100
+
+# Upload per distinct (description body, paste title) pair, by blake2b hex
+# digest, so a description met twice shares one upload. The title is part of
+# the key, as in the paste service's own cache, so a paste is never reused
+# under another task's title.
+_seen: dict[str, asyncio.Task] = {}
+
+# Upload outcomes by the same digest, kept across runs: a stored URL is reused
+# without uploading, and a failure is not retried for _RETRY_FAILED_AFTER
+# seconds, so rerunning a partially failed migration costs almost nothing.
+HASH_CACHE_PATH = Path.home() / ".cache" / "offload_migration" / "hashes.sqlite"
+_RETRY_FAILED_AFTER = 24 * 3600
+_hash_db: Optional[sqlite3.Connection] = None
+
+
+# Crash-resume marker: key of the last task known to be fully migrated, so a
+# run that ends early resumes after it. It is not a watermark. Task keys are
+# task names, so new and renamed tasks can sort anywhere, and a run that
+# finishes cleanly deletes the marker so the next run scans everything.
+CHECKPOINT_PATH = HASH_CACHE_PATH.parent / "checkpoint"
+
+
+def _read_checkpoint(path: Path = CHECKPOINT_PATH) -> Optional[str]:
+    try:
+        return path.read_text(encoding="utf-8").strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def _write_checkpoint(task_key: str, path: Path = CHECKPOINT_PATH):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(task_key, encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def _clear_checkpoint(path: Path = CHECKPOINT_PATH):
+    path.unlink(missing_ok=True)
+    path.with_suffix(".tmp").unlink(missing_ok=True)
+
+
+def _open_hash_cache(path: Path = HASH_CACHE_PATH) -> sqlite3.Connection:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE IF NOT EXISTS hashes "
+                 "(hash TEXT PRIMARY KEY, paste_url TEXT, tried_at INTEGER)")
+    return conn
+
+
+def _cached_outcome(digest: str) -> tuple[bool, Optional[str]]:
+    """(skip upload, paste URL) from a previous run for this digest."""
+    if _hash_db is None:
+        return False, None
+    row = _hash_db.execute(
+        "SELECT paste_url, tried_at FROM hashes WHERE hash=?", (digest,)).fetchone()
+    if row is None:
+        return False, None
+    paste_url, tried_at = row
+    if paste_url:
+        return True, paste_url
+    return time.time() - tried_at < _RETRY_FAILED_AFTER, None
+
+
+def _record_outcome(digest: str, paste_url: Optional[str]):
+    if _hash_db is None:
+        return
+    with _hash_db:
+        _hash_db.execute("INSERT OR REPLACE INTO hashes VALUES (?, ?, ?)",
+                         (digest, paste_url, int(time.time())))
+
+
+async def _upload(digest: str, desc: str, title: str, session) -> str:
+    skip, paste_url = _cached_outcome(digest)
+    if skip:
+        if paste_url:
+            logger.info("Reusing paste from a previous run: %s", paste_url)
+            return paste_url
+        logger.info("Skipping %r: its upload failed within the last day", title)
+        return desc
+    try:
+        new_desc = await async_offload_description(desc, title=title, session=session,
+                                                   raise_unavailable=True)
+    except PasteUnavailable as e:
+        # Nothing was sent, so nothing is recorded: the next run tries again.
+        logger.warning("Not offloading %r: %s", title, e)
+        return desc
+    _record_outcome(digest, new_desc if new_desc != desc else None)
+    return new_desc
+
+
+async def _offload_once(desc: str, title: str, session) -> str:
+    """async_offload_description, shared by every job with the same text and title.
+
+    Jobs that arrive while the first upload is still in flight await it too.
+    """
+    h = hashlib.blake2b(title.encode("utf-8", "surrogatepass"), digest_size=16)
+    h.update(b"\0")
+    h.update(desc.encode("utf-8", "surrogatepass"))
+    digest = h.hexdigest()
+    upload = _seen.get(digest)
+    if upload is None:
+        upload = _seen[digest] = asyncio.ensure_future(_upload(digest, desc, title, session))
+    return await upload
+
+
+class Job(NamedTuple):
+    """One description to offload: a task's own, or one of its subtasks'."""
+    task_uuid: str
+    subtask_id: Optional[int]  # None for the task description
+    task_name: str
+    description: str
+
+    @property
+    def field(self) -> str:
+        return 'task_description' if self.subtask_id is None else f'subtask:{self.subtask_id}'
+
+    @property
+    def title(self) -> str:
+        if self.subtask_id is None:
+            return f"{self.task_name} — Description"
+        return f"{self.task_name} — Subtask #{self.subtask_id}"
+
+
+async def _worker(job: Job, session, failed: list) -> Optional[str]:
+    """Upload one job's description; return its paste URL, or None on failure."""
+    try:
+        new_desc = await _offload_once(job.description, job.title, session)
+    except Exception as e:
+        logger.error("Failed to offload %s for task %s: %s", job.field, job.task_uuid, e, exc_info=e)
+        failed.append((job.task_uuid, job.field, str(e)))
+        return None
+    if new_desc == job.description:
+        logger.warning("Offload attempt returned original text for %s of task %r — paste may be unreachable",
+                       job.field, job.task_name)
+        failed.append((job.task_uuid, job.field))
+        return None
+    logger.info("Offload candidate for %s of task %r: %s", job.field, job.task_name, new_desc)
+    return new_desc
+
+
+async def main(dry_run: bool = True, restart: bool = False):
+    global _hash_db
+    _hash_db = _open_hash_cache()
     ts = TaskService()
-    tasks = ts.get_all_tasks()
-    total_tasks = len(tasks)
-    task_count = 0
+    start_after = None if restart else _read_checkpoint()
+    checkpoint = start_after
+    # Candidate tasks not yet behind the checkpoint as (task key, uuid), in
+    # scan (key) order, and how many of each one's descriptions are unsaved.
+    # A failed upload or save is never counted down, so it holds the
+    # checkpoint before its task.
+    unsaved_tasks: deque[tuple[str, str]] = deque()
+    unsaved_jobs: dict[str, int] = {}
+    total_tasks = 0
     offloaded_tasks = 0
     offloaded_subtasks = 0
     failed = []
+    # Three stages joined by bounded queues, so a slow paste server does not
+    # hold up the scan and slow saves do not hold up uploads:
+    # producer -> scan_q -> uploaders -> write_q -> writer.
+    scan_q: asyncio.Queue = asyncio.Queue(maxsize=_QUEUE_SIZE)
+    write_q: asyncio.Queue = asyncio.Queue(maxsize=_QUEUE_SIZE)
 
-    logger.info(f"Found {total_tasks} tasks to scan for long descriptions")
+    async def producer():
+        nonlocal total_tasks
+        try:
+            async for task, long_task, long_subtasks in ts.iter_long_description_tasks(
+                    DESCRIPTION_PASTE_THRESHOLD, start_after=start_after):
+                total_tasks += 1
+                logger.debug("[%d] Task %r (uuid=%s) has long descriptions", total_tasks, task.name, task.uuid)
+                jobs = [Job(task.uuid, st.id, task.name, st.description) for st in long_subtasks]
+                if long_task:
+                    jobs.insert(0, Job(task.uuid, None, task.name, task.description))
+                unsaved_tasks.append((task.id, task.uuid))
+                unsaved_jobs[task.uuid] = len(jobs)
+                for job in jobs:
+                    # job.field builds a string; skip it when INFO is off.
+                    if logger.isEnabledFor(logging.INFO):
+                        logger.info("%s of task %r is over threshold — would offload", job.field, job.task_name)
+                    await scan_q.put(job)
+        finally:
+            for _ in range(MAX_CONCURRENT_OFFLOADS):
+                await scan_q.put(None)
 
-    for task in tasks:
-        task_count += 1
-        logger.info(f"[{task_count}/{total_tasks}] Scanning task '{task.name}' (uuid={task.uuid})")
+    async def uploader(session):
+        while (job := await scan_q.get()) is not None:
+            new_desc = await _worker(job, session, failed)
+            if new_desc is not None:
+                await write_q.put((job, new_desc))
 
-        # Task description
-        desc = task.description or ""
-        if desc and len(desc) > DESCRIPTION_PASTE_THRESHOLD and not is_paste_url(desc):
-            logger.info(f"Task '{task.name}' description > {DESCRIPTION_PASTE_THRESHOLD} chars — would offload")
+    async def uploaders():
+        # One keep-alive pool for the whole run, one connection per uploader.
+        async with new_paste_session(limit=MAX_CONCURRENT_OFFLOADS) as session:
             try:
-                new_desc = offload_description(desc, title=f"{task.name} — Description")
-                if new_desc != desc:
-                    logger.info(f"Offload candidate: {new_desc}")
-                    if not dry_run:
-                        await ts.update_task_description_by_uuid(task.uuid, new_desc)
-                        offloaded_tasks += 1
-                        logger.info(f"Offloaded task '{task.name}' to {new_desc}")
-                else:
-                    logger.warning(f"Offload attempt returned original text for task '{task.name}' — paste may be unreachable")
-                    failed.append((task.uuid, 'task_description'))
-            except Exception as e:
-                logger.exception(f"Failed to offload description for task {task.uuid}: {e}")
-                failed.append((task.uuid, 'task_description', str(e)))
-
-        # Subtasks
-        subtasks = getattr(task, 'subtasks', []) or []
-        for st in subtasks:
-            st_desc = st.get('description', '') or ''
-            st_id = st.get('id')
-            if st_desc and len(st_desc) > DESCRIPTION_PASTE_THRESHOLD and not is_paste_url(st_desc):
-                logger.info(f"Subtask #{st_id} for task '{task.name}' is over threshold — would offload")
-                try:
-                    new_st_desc = offload_description(st_desc, title=f"{task.name} — Subtask #{st_id}")
-                    if new_st_desc != st_desc:
-                        logger.info(f"Offload candidate for subtask #{st_id}: {new_st_desc}")
-                        if not dry_run:
-                            await ts.upsert_subtask_by_id(task.uuid, st_id, st.get('name',''), new_st_desc, st.get('url',''))
-                            offloaded_subtasks += 1
-                            logger.info(f"Offloaded subtask #{st_id} for task '{task.name}' to {new_st_desc}")
-                    else:
-                        logger.warning(f"Offload attempt returned original text for subtask #{st_id} in task '{task.name}'")
-                        failed.append((task.uuid, f'subtask:{st_id}'))
-                except Exception as e:
-                    logger.exception(f"Failed to offload subtask #{st_id} for task {task.uuid}: {e}")
-                    failed.append((task.uuid, f'subtask:{st_id}', str(e)))
-
-    logger.info(f"Done. Tasks scanned: {total_tasks}. Offloaded tasks: {offloaded_tasks}. Offloaded subtasks: {offloaded_subtasks}.")
+                async with asyncio.TaskGroup() as tg:
+                    for _ in range(MAX_CONCURRENT_OFFLOADS):
+                        tg.create_task(uploader(session))
+            finally:
+                await write_q.put(None)
+
+    def advance_checkpoint():
+        # Move past every leading task whose descriptions are all saved.
+        nonlocal checkpoint
+        moved = False
+        while unsaved_tasks and not unsaved_jobs[unsaved_tasks[0][1]]:
+            checkpoint, task_uuid = unsaved_tasks.popleft()
+            del unsaved_jobs[task_uuid]
+            moved = True
+        if moved:
+            _write_checkpoint(checkpoint)
+            logger.info("Checkpoint saved at task key %r", checkpoint)
+
+    async def save(batch: list):
+        # One load and one save per batch instead of one per description.
+        nonlocal offloaded_tasks, offloaded_subtasks
+        task_updates = {job.task_uuid: new_desc for job, new_desc in batch if job.subtask_id is None}
+        subtask_updates = {(job.task_uuid, job.subtask_id): new_desc
+                           for job, new_desc in batch if job.subtask_id is not None}
+        try:
+            await ts.update_descriptions_by_uuid(task_updates, subtask_updates)
+        except Exception as e:
+            logger.exception("Failed to save offloaded descriptions: %s", e)
+            failed.extend((job.task_uuid, job.field, str(e)) for job, _ in batch)
+            return
+        offloaded_tasks += len(task_updates)
+        offloaded_subtasks += len(subtask_updates)
+        logger.info("Wrote %d task and %d subtask paste links", len(task_updates), len(subtask_updates))
+        for job, _ in batch:
+            unsaved_jobs[job.task_uuid] -= 1
+        advance_checkpoint()
+
+    async def writer():
+        batch = []
+        while (item := await write_q.get()) is not None:
+            if dry_run:
+                continue
+            batch.append(item)
+            if len(batch) >= WRITE_BATCH_SIZE:
+                await save(batch)
+                batch = []
+        if batch:
+            await save(batch)
+
+    logger.info("Scanning tasks for descriptions > %d chars", DESCRIPTION_PASTE_THRESHOLD)
+    if start_after is not None:
+        logger.info("Resuming after task key %r (use --restart to scan everything)", start_after)
+
+    async with asyncio.TaskGroup() as tg:
+        tg.create_task(producer())
+        tg.create_task(uploaders())
+        tg.create_task(writer())
+
+    if not dry_run and not failed and not unsaved_tasks:
+        # Everything was migrated; see CHECKPOINT_PATH for why nothing is kept.
+        _clear_checkpoint()
+        if start_after is not None or checkpoint is not None:
+            logger.info("Run complete; checkpoint cleared")
+
+    logger.info("Done. Tasks with long descriptions: %d. Offloaded tasks: %d. Offloaded subtasks: %d.",
+                total_tasks, offloaded_tasks, offloaded_subtasks)
     if failed:
-        logger.warning(f"Some offloads failed: {failed}")
+        logger.warning("Some offloads failed: %s", failed)
+    _hash_db.close()
+    _hash_db = None
 
-if __name__ == '__main__':
+
+def cli(argv: Optional[list[str]] = None):
+    """Command-line entry point: dry-run unless --confirm is given."""
     parser = argparse.ArgumentParser()
     parser.add_argument('--confirm', action='store_true', help='Apply changes (otherwise dry-run)')
-    args = parser.parse_args()
-    asyncio.run(main(dry_run=not args.confirm))
+    parser.add_argument('--restart', action='store_true',
+                        help='Ignore the saved checkpoint and scan every task')
+    args = parser.parse_args(argv)
+    listener = _setup_logging()
+    # uvloop's cheaper scheduling pays off with this many small awaits.
+    loop_factory = uvloop.new_event_loop if uvloop is not None else None
+    try:
+        with asyncio.Runner(loop_factory=loop_factory) as runner:
+            runner.run(main(dry_run=not args.confirm, restart=args.restart))
+    finally:
+        # Flushes any records still queued.
+        listener.stop()
+
+
+if __name__ == '__main__':
+    cli()